@@ -0,0 +1,22 @@
+"""Helpers to build, render and publish Manim Slides decks."""
+
+from .coalesce import CoalescingSlide
+from .draft import DraftSlide
+from .framesplit import FrameSplitSlide
+from .holds import HoldSlide
+from .incremental import IncrementalSlide
+from .lifecycle import LifecycleSlide
+from .profiling import ProfiledSlide
+from .sections import SectionedSlide, fast_forward
+
+__all__ = [
+    "CoalescingSlide",
+    "DraftSlide",
+    "FrameSplitSlide",
+    "HoldSlide",
+    "IncrementalSlide",
+    "LifecycleSlide",
+    "ProfiledSlide",
+    "SectionedSlide",
+    "fast_forward",
+]
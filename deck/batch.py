@@ -0,0 +1,362 @@
+"""Build many decks at once, on one pool of worker processes.
+
+Usage::
+
+    python -m deck.batch intuitive_limits.py week2/derivatives.py:TeachingDemo -j 8
+    python -m deck.batch --manifest decks.json -o _site
+
+A deck is a scene file, optionally followed by ``:`` and the comma-separated
+scenes to build; by default, every :class:`~deck.sections.SectionedSlide`
+the file defines. A manifest lists decks as JSON, with paths relative to
+the manifest::
+
+    {"decks": [{"file": "intuitive_limits.py", "scenes": ["TeachingDemo"],
+                "dest": ".", "title": "Intuitive Limits"}]}
+
+Each deck is exported in ``DEST/<name>`` (``DEST/<dest>`` if the manifest
+gives one), its name being the file name without extension unless the
+manifest sets ``"name"``. It is exported with ``manim-slides convert`` by
+default, or to the lazily loading player of :mod:`deck.web` with
+``--player lazy`` (or ``"player": "lazy"`` in its manifest entry).
+
+The build is a graph of jobs: every section of every scene is rendered on
+its own, as with :mod:`deck.parallel`; once all sections of a scene are
+done, its slide videos are joined (the segments); once all scenes of a deck
+are, the deck is exported to HTML. The jobs run on ``--jobs`` worker
+processes, those of the decks closest to completion first, so that decks
+come out one after the other and new section jobs keep every worker busy.
+
+The workers are reused from one job to the next, so their caches are shared
+between decks: the glyph cache of :mod:`deck.glyph_cache` on disk and in
+memory, the axes and graphs of :mod:`deck.geometry` and the glyphs of
+:mod:`deck.readout`. Manim's TeX and text SVG directories are shared too,
+in ``$DECK_CACHE_DIR``, while each deck has its own media directory and
+``slides/`` folder under ``--build-dir`` (default: ``build``), so that
+decks with the same scene names do not clash.
+
+Every finished job is recorded in ``BUILD_DIR/state.json``, with a key
+made from the deck's scene file, the ``deck`` package and the render
+options. An interrupted build started again skips the jobs recorded with
+an unchanged key (and whose output is still there); ``--restart`` ignores
+the record. A failed job is reported and its dependents are skipped, the
+other decks are still built.
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import multiprocessing
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from contextlib import contextmanager
+from pathlib import Path
+
+from manim import logger, tempconfig
+
+from .daemon import reset_defaults
+from .glyph_cache import cache_dir
+from .incremental import static_fingerprints
+from .parallel import merge_sections, render_section
+from .runner import add_render_arguments, configure, load_module, load_scene, render_options
+from .sections import SectionedSlide
+from .web import export_reveal, export_web
+
+# Jobs of the same deck finish it sooner the later their stage.
+_PRIORITY = {"html": 0, "segments": 1, "section": 2}
+
+
+class Job:
+    """A node of the build graph."""
+
+    def __init__(self, kind, deck, scene=None, section=None, needs=()):
+        self.kind = kind
+        self.deck = deck
+        self.scene = scene
+        self.section = section
+        self.needs = tuple(needs)
+        self.id = ":".join(part for part in (deck["name"], scene, section, kind) if part)
+
+    def arguments(self, results):
+        """The job function and its arguments, given the results of the jobs it needs."""
+        if self.kind == "section":
+            return section_job, (self.deck, self.scene, self.section)
+        if self.kind == "segments":
+            entries = {need.section: results[need.id] for need in self.needs}
+            return segments_job, (self.deck, self.scene, entries)
+        return html_job, (self.deck,)
+
+    def output(self):
+        """A file the job writes, which must still exist for it to be skipped."""
+        if self.kind == "segments":
+            return Path(self.deck["slides"]) / f"{self.scene}.json"
+        if self.kind == "html":
+            page = "manifest.json" if self.deck["player"] == "lazy" else "index.html"
+            return Path(self.deck["dest"]) / page
+        return None
+
+
+@contextmanager
+def deck_context(deck):
+    """Run a job of ``deck`` from its directory, in a fresh ``config``."""
+    cwd = os.getcwd()
+    os.chdir(Path(deck["file"]).parent)
+    try:
+        with tempconfig({}):
+            yield
+    finally:
+        # Reused workers must not carry one deck's defaults into the next.
+        reset_defaults()
+        static_fingerprints.cache_clear()
+        os.chdir(cwd)
+
+
+def section_job(deck, scene_name, section):
+    """Render one section; return its manifest entry (see :mod:`deck.parallel`)."""
+    with deck_context(deck):
+        return render_section(deck["file"], scene_name, deck["options"], section)
+
+
+def segments_job(deck, scene_name, entries):
+    """Join the rendered sections of a scene into the slide videos of ``slides/``."""
+    with deck_context(deck):
+        configure(deck["options"])
+        scene = load_scene(deck["file"], scene_name)()
+        scene._output_folder = Path(deck["slides"])
+        merge_sections(scene, entries)
+        scene.render()
+
+
+def html_job(deck):
+    """Export the scenes of a deck to HTML."""
+    title = {"title": deck["title"]} if deck.get("title") else {}
+    export = export_web if deck["player"] == "lazy" else export_reveal
+    export(deck["scenes"], deck["dest"], folder=Path(deck["slides"]), **title)
+
+
+def parse_deck(spec):
+    """A manifest entry for ``FILE[:SCENE,...]``."""
+    file, _, scenes = spec.partition(":")
+    return {"file": file, "scenes": scenes.split(",") if scenes else None}
+
+
+def resolve_decks(entries, dest, build_dir, options, player="convert"):
+    """Complete the ``(base, entry)`` manifest entries with paths and render options."""
+    decks, names = [], set()
+    media_root = Path(options["media_dir"] or build_dir / "media").resolve()
+    for base, entry in entries:
+        file = (base / entry["file"]).resolve()
+        name = entry.get("name", file.stem)
+        if name in names:
+            raise SystemExit(f"Two decks are named {name!r}; set \"name\" in the manifest")
+        names.add(name)
+        decks.append(
+            {
+                "name": name,
+                "file": str(file),
+                "scenes": entry.get("scenes"),
+                "title": entry.get("title"),
+                "player": entry.get("player", player),
+                "dest": str((dest / entry.get("dest", name)).resolve()),
+                "slides": str((build_dir / "slides" / name).resolve()),
+                "options": {
+                    **options,
+                    "media_dir": str(media_root / name),
+                    "config": {
+                        "tex_dir": str(cache_dir().resolve() / "Tex"),
+                        "text_dir": str(cache_dir().resolve() / "texts"),
+                    },
+                },
+            }
+        )
+    return decks
+
+
+def build_graph(decks):
+    """The jobs building ``decks``, each after the jobs it needs."""
+    jobs = []
+    for deck in decks:
+        with deck_context(deck):
+            configure(deck["options"])
+            module = load_module(deck["file"])
+            if deck["scenes"] is None:
+                deck["scenes"] = [
+                    name
+                    for name, value in vars(module).items()
+                    if isinstance(value, type)
+                    and issubclass(value, SectionedSlide)
+                    and value.__module__ == module.__name__
+                    and value.sections
+                ]
+            sections = {name: getattr(module, name).sections for name in deck["scenes"]}
+
+        segments = []
+        for scene, names in sections.items():
+            section_jobs = [Job("section", deck, scene, section) for section in names]
+            segments.append(Job("segments", deck, scene, needs=section_jobs))
+            jobs += section_jobs
+        jobs += segments
+        jobs.append(Job("html", deck, needs=segments))
+    return jobs
+
+
+def deck_key(deck):
+    """Digest of what a deck's jobs depend on."""
+    digest = hashlib.sha256(json.dumps(deck, sort_keys=True).encode())
+    package = Path(__file__).parent
+    sources = [Path(deck["file"]), *sorted(package.glob("*.py")), *sorted(package.glob("player/*"))]
+    for path in sources:
+        digest.update(path.read_bytes())
+    return digest.hexdigest()
+
+
+class BuildState:
+    """Finished jobs, saved after each one so that a build can be resumed."""
+
+    def __init__(self, path, restart=False):
+        self.path = Path(path)
+        self.jobs = {}
+        if self.path.exists() and not restart:
+            try:
+                self.jobs = json.loads(self.path.read_text())["jobs"]
+            except (ValueError, KeyError):
+                logger.warning(f"Ignoring corrupted '{self.path}'")
+
+    def finished(self, job, key):
+        """Whether ``job`` was finished with ``key``, and its result."""
+        record = self.jobs.get(job.id)
+        output = job.output()
+        if record is None or record["key"] != key or (output and not output.exists()):
+            return False, None
+        return True, record["result"]
+
+    def record(self, job, key, result):
+        self.jobs[job.id] = {"key": key, "result": result}
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        temporary = self.path.with_suffix(".tmp")
+        temporary.write_text(json.dumps({"jobs": self.jobs}, indent=2))
+        os.replace(temporary, self.path)
+
+
+def run_graph(jobs, state, workers):
+    """Run ``jobs`` on ``workers`` processes; return the ids of the failed ones."""
+    keys = {}
+    for job in jobs:
+        if job.deck["name"] not in keys:
+            keys[job.deck["name"]] = deck_key(job.deck)
+    order = {job.id: index for index, job in enumerate(jobs)}
+    pending = {job.id: job for job in jobs}
+    results, rerun, failed, running = {}, set(), set(), {}
+
+    def ready():
+        for job in sorted(pending.values(), key=lambda job: (_PRIORITY[job.kind], order[job.id])):
+            if all(need.id in results for need in job.needs):
+                yield job
+
+    start = time.perf_counter()
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(workers, mp_context=context) as pool:
+        try:
+            while pending or running:
+                for job in list(pending.values()):
+                    if any(need.id in failed for need in job.needs):
+                        del pending[job.id]
+                        failed.add(job.id)
+                        logger.error(f"Skipped {job.id}: a job it needs failed")
+
+                for job in ready():
+                    key = keys[job.deck["name"]]
+                    finished, result = state.finished(job, key)
+                    if finished and not any(need.id in rerun for need in job.needs):
+                        del pending[job.id]
+                        results[job.id] = result
+                    elif len(running) < workers:
+                        del pending[job.id]
+                        function, arguments = job.arguments(results)
+                        running[pool.submit(function, *arguments)] = job
+                if not running:
+                    continue
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    job = running.pop(future)
+                    try:
+                        result = future.result()
+                    except Exception as error:
+                        failed.add(job.id)
+                        logger.error(f"{job.id} failed: {error!r}")
+                        continue
+                    results[job.id] = result
+                    rerun.add(job.id)
+                    state.record(job, keys[job.deck["name"]], result)
+                    logger.info(f"{job.id} done after {time.perf_counter() - start:.1f}s")
+        except KeyboardInterrupt:
+            pool.shutdown(wait=False, cancel_futures=True)
+            raise
+    return failed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m deck.batch", description=__doc__.splitlines()[0]
+    )
+    parser.add_argument(
+        "decks", nargs="*", metavar="FILE[:SCENE,...]", help="Scene files (and scenes) to build."
+    )
+    parser.add_argument("--manifest", type=Path, help="JSON file listing the decks to build.")
+    parser.add_argument(
+        "-o", "--dest", type=Path, default=Path("_site"), help="Output folder (default: _site)."
+    )
+    parser.add_argument(
+        "--build-dir",
+        type=Path,
+        default=Path("build"),
+        help="Folder of the media, slides and build state (default: build).",
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=os.cpu_count(),
+        help="Number of worker processes (default: number of CPUs).",
+    )
+    parser.add_argument(
+        "--player",
+        choices=("convert", "lazy"),
+        default="convert",
+        help="Export with manim-slides convert (default) or the lazy player of deck.web.",
+    )
+    parser.add_argument(
+        "--restart", action="store_true", help="Build everything, ignoring the saved state."
+    )
+    add_render_arguments(parser)
+    args = parser.parse_args(argv)
+
+    entries = [(Path.cwd(), parse_deck(spec)) for spec in args.decks]
+    if args.manifest:
+        manifest = json.loads(args.manifest.read_text())
+        entries += [(args.manifest.parent, entry) for entry in manifest["decks"]]
+    if not entries:
+        parser.error("no decks given")
+
+    os.environ.pop("DECK_DRAFT", None)
+    decks = resolve_decks(
+        entries, args.dest, args.build_dir, render_options(args), args.player
+    )
+
+    start = time.perf_counter()
+    jobs = build_graph(decks)
+    state = BuildState(args.build_dir / "state.json", restart=args.restart)
+    failed = run_graph(jobs, state, args.jobs)
+    print(
+        f"Built {len(decks) - len({job.split(':')[0] for job in failed})} of {len(decks)} "
+        f"decks ({len(jobs)} jobs) in {time.perf_counter() - start:.1f}s"
+    )
+    if failed:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
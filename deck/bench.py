@@ -0,0 +1,436 @@
+"""Benchmarks of the workloads of a deck, compared against stored baselines.
+
+Usage::
+
+    python -m deck.bench                       # run, compare with benchmarks.json
+    python -m deck.bench --save                # record the baselines
+    python -m deck.bench -k riemann -k table   # only some benchmarks
+
+Each benchmark reproduces a pattern of ``intuitive_limits.py`` with the
+Cairo camera, headless: a ``ValueTracker`` sweep driving tracked mobjects
+(``visualizing_derivatives``), the Riemann sum refinements and their
+``Transform`` (``visualizing_integrals``), the ``DecimalTable`` of
+``table_of_values`` and its cell reveals (also with
+:class:`~deck.readout.GlyphReadout` cells), ``Text``/``Tex``/``MathTex``
+creation, ``paragraph()`` layout and the full ``TeachingDemo`` render at low
+and high quality.
+
+Every benchmark runs in a fresh process: one warm-up run (which also fills
+manim's SVG caches in a temporary media directory), then ``--repeat`` timed
+runs; the deck renders are timed cold, in a new media directory each time.
+It reports the median, minimum and spread of the timings and the peak RSS
+of its process. The persistent glyph cache is disabled so that the numbers
+measure manim and the ``deck`` helpers themselves.
+
+A benchmark regresses when its median time exceeds the baseline by more
+than ``--threshold`` (10% by default) or its peak RSS by more than
+``--memory-threshold`` (20%); a ``"threshold"`` or ``"memory_threshold"``
+stored with a baseline entry takes precedence. The command exits with
+status 1 on any regression. Baselines only compare meaningfully on the
+machine that recorded them.
+
+The committed ``benchmarks.json`` therefore holds no timings, only the
+thresholds of each benchmark on CI machines. The ``benchmarks`` workflow
+copies it, stores the results of the base commit into the copy with
+``--save --results`` (which keeps the thresholds) and compares the new
+commit with them. The results of each commit on ``main`` are cached by
+commit, so the base commit is only run again, on the same runner, when its
+results are not in the cache.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from .profiling import peak_rss_mb
+from .runner import QUALITIES, configure, load_module, load_scene
+
+BENCHMARKS = {}
+
+
+def benchmark(repeat=5, warmup=True):
+    """Register a benchmark: a function of the deck file returning the timed callable."""
+
+    def register(function):
+        BENCHMARKS[function.__name__] = (function, repeat, warmup)
+        return function
+
+    return register
+
+
+def _animate(animation, run_time, camera, mobjects):
+    """Play ``animation`` frame by frame as a scene would, rasterizing each frame."""
+    from manim import config
+    from manim.animation.animation import prepare_animation
+
+    animation = prepare_animation(animation)
+    frames = max(1, int(run_time * config.frame_rate))
+    dt = 1 / config.frame_rate
+    animation.begin()
+    for frame in range(1, frames + 1):
+        animation.update_mobjects(dt)
+        animation.interpolate(frame / frames)
+        for mobject in mobjects:
+            mobject.update(dt)
+        camera.reset()
+        camera.capture_mobjects(mobjects)
+    animation.finish()
+
+
+@benchmark()
+def tracker_sweep(deck):
+    import numpy as np
+    from manim import BLACK, BLUE, RED, Axes, Camera, ValueTracker, linear
+
+    from .tracked import tracked_dot, tracked_secant
+
+    ax = Axes(x_length=6, y_length=3, tips=False, axis_config={"color": BLACK})
+    function = ax.plot(np.sin, x_range=[-6, 6, 1], color=BLUE)
+    k = ValueTracker(-3 / 2 * np.pi)
+    secant = tracked_secant(ax, function, k, dx=0.05, secant_line_length=1.5, secant_line_color=RED)
+    dot = tracked_dot(ax, function, k, color=BLACK)
+    camera = Camera()
+
+    def run():
+        k.set_value(-3 / 2 * np.pi)
+        _animate(
+            k.animate(rate_func=linear).set_value(3 / 2 * np.pi),
+            5,
+            camera,
+            [ax, function, secant, dot],
+        )
+
+    return run
+
+
+@benchmark()
+def riemann_refinements(deck):
+    import numpy as np
+    from manim import BLACK, Axes, Camera, Transform
+
+    from . import riemann
+
+    ax = Axes(x_range=(-1, 12, 1), y_range=(-1, 3, 1), x_length=6, y_length=3, tips=False)
+    function = ax.plot(lambda x: 0.7 * np.sqrt(x), x_range=[0, 12, 0.05], color=BLACK)
+    camera = Camera()
+
+    def run():
+        refinements = riemann.riemann_refinements(
+            ax,
+            function,
+            x_range=[1, 11],
+            dxs=[1 / i for i in range(1, 10)],
+            per_dx=lambda dx: {
+                "stroke_width": dx if dx > 0.1 else 0.8,
+                "stroke_color": BLACK if dx > 0.1 else None,
+            },
+        )
+        r = next(refinements)
+        for finer in refinements:
+            _animate(Transform(r, finer), 1, camera, [ax, function, r])
+
+    return run
+
+
+@benchmark()
+def decimal_table(deck):
+    from manim import BLACK, WHITE, Camera, DecimalTable, MathTex
+
+    camera = Camera()
+
+    def run():
+        table = DecimalTable(
+            [
+                [0.90, 0.99, 0.999, 0.9999, 1.0001, 1.001, 1.01, 1.1],
+                [2.7100, 2.9701, 2.9970, 2.9997, 3.0003, 3.0030, 3.3031, 3.31],
+            ],
+            row_labels=[MathTex(r"x"), MathTex(r"f(x)")],
+            element_to_mobject_config={"num_decimal_places": 4, "color": BLACK, "font_size": 36},
+            line_config={"color": BLACK},
+            include_outer_lines=True,
+            h_buff=1,
+        ).scale(0.7)
+        cells = table.get_entries_without_labels()
+        cells.set_color(WHITE)
+        for cell in cells:
+            _animate(cell.animate.set_color(BLACK), 0.5, camera, [table])
+
+    return run
+
+
+@benchmark()
+def glyph_readout_table(deck):
+    from manim import BLACK, WHITE, Camera, DecimalTable, MathTex
+
+    from .readout import GlyphReadout
+
+    camera = Camera()
+
+    def run():
+        table = DecimalTable(
+            [
+                [0.90, 0.99, 0.999, 0.9999, 1.0001, 1.001, 1.01, 1.1],
+                [2.7100, 2.9701, 2.9970, 2.9997, 3.0003, 3.0030, 3.3031, 3.31],
+            ],
+            row_labels=[MathTex(r"x"), MathTex(r"f(x)")],
+            element_to_mobject=GlyphReadout,
+            element_to_mobject_config={"num_decimal_places": 4, "color": BLACK, "font_size": 36},
+            line_config={"color": BLACK},
+            include_outer_lines=True,
+            h_buff=1,
+        ).scale(0.7)
+        cells = table.get_entries_without_labels()
+        cells.set_color(WHITE)
+        for cell in cells:
+            _animate(cell.animate.set_color(BLACK), 0.5, camera, [table])
+
+    return run
+
+
+@benchmark()
+def text_creation(deck):
+    from manim import ITALIC, RED_E, MathTex, Tex, Text
+
+    def run():
+        for text, size in [
+            ("Conceptualizing Limits", 48),
+            ("Graphical Approach", 33.6),
+            ("Consider the function", 24),
+        ]:
+            Text(text, font_size=size)
+        Text(
+            "Limits do not care whether a function is defined \n or not at a particular point.",
+            font_size=33.6,
+            slant=ITALIC,
+        )
+        Text(
+            "What matters to Limits is what value the function \n (or output) is approaching",
+            font_size=33.6,
+            t2c={"what value the function": RED_E},
+            t2s={"what value the function": ITALIC},
+        )
+        MathTex(r"f(x) = \frac{x^3-1}{x-1}, \quad -2 \leq x \leq 2", font_size=36)
+        MathTex(r"\lim_{x\to1}f(x) = 3", font_size=36)
+        Tex(r"What happens to $f(x)$ as \\$x$ approaches 1?", font_size=33.6)
+
+    return run
+
+
+@benchmark()
+def paragraph_layout(deck):
+    paragraph = load_module(deck).paragraph
+
+    def run():
+        paragraph(
+            "1. understand limits in relation to Calculus; and",
+            "2. explain the concept of limits graphically and analytically.",
+            font_size=33.6,
+        )
+
+    return run
+
+
+def _deck_render(quality):
+    def setup(deck):
+        def run():
+            with tempfile.TemporaryDirectory() as directory:
+                cwd = os.getcwd()
+                os.chdir(directory)  # Manim Slides writes ./slides
+                try:
+                    configure({"quality": quality, "media_dir": directory})
+                    load_scene(deck, "TeachingDemo")().render()
+                finally:
+                    os.chdir(cwd)
+
+        return run
+
+    setup.__name__ = f"deck_render_{quality}"
+    return setup
+
+
+benchmark(repeat=1, warmup=False)(_deck_render("l"))
+benchmark(repeat=1, warmup=False)(_deck_render("h"))
+
+
+def run_benchmark(name, deck, quality, repeat):
+    """Run one benchmark in this process and return its measurements."""
+    os.environ["DECK_GLYPH_CACHE"] = "0"
+    os.environ["DECK_INCREMENTAL"] = "0"
+    function, _, warmup = BENCHMARKS[name]
+    with tempfile.TemporaryDirectory() as media_dir:
+        configure({"quality": quality, "media_dir": media_dir})
+        run = function(deck)
+        if warmup:
+            run()
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            run()
+            timings.append(time.perf_counter() - start)
+
+    return {
+        "median": statistics.median(timings),
+        "min": min(timings),
+        "stdev": statistics.stdev(timings) if len(timings) > 1 else 0.0,
+        "repeat": repeat,
+        "peak_rss_mb": peak_rss_mb(),
+    }
+
+
+def environment():
+    from importlib.metadata import version
+
+    return {
+        "manim": version("manim"),
+        "manim-slides": version("manim-slides"),
+        "python": platform.python_version(),
+        "machine": f"{platform.system()} {platform.machine()}, {os.cpu_count()} CPUs",
+    }
+
+
+def compare(name, result, baseline, threshold, memory_threshold):
+    """Return the regressions of ``result`` against its ``baseline`` entry."""
+    regressions = []
+    limit = baseline.get("threshold", threshold)
+    if result["median"] > baseline["median"] * (1 + limit):
+        regressions.append(
+            f"{name}: {result['median']:.3f}s vs {baseline['median']:.3f}s "
+            f"(+{result['median'] / baseline['median'] - 1:.0%}, limit +{limit:.0%})"
+        )
+    limit = baseline.get("memory_threshold", memory_threshold)
+    if (
+        result["peak_rss_mb"] is not None
+        and baseline.get("peak_rss_mb")
+        and result["peak_rss_mb"] > baseline["peak_rss_mb"] * (1 + limit)
+    ):
+        regressions.append(
+            f"{name}: peak RSS {result['peak_rss_mb']:.0f} MiB vs "
+            f"{baseline['peak_rss_mb']:.0f} MiB (limit +{limit:.0%})"
+        )
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m deck.bench", description=__doc__.splitlines()[0]
+    )
+    parser.add_argument(
+        "--deck",
+        type=Path,
+        default=Path("intuitive_limits.py"),
+        help="Scene file defining TeachingDemo and paragraph() (default: intuitive_limits.py).",
+    )
+    parser.add_argument(
+        "-k",
+        dest="patterns",
+        action="append",
+        help="Only run the benchmarks whose name contains this string (repeatable).",
+    )
+    parser.add_argument("--list", action="store_true", help="List the benchmarks and exit.")
+    parser.add_argument(
+        "-q",
+        "--quality",
+        choices=QUALITIES,
+        default="l",
+        help="Render quality of the benchmarks other than the deck renders (default: l).",
+    )
+    parser.add_argument("--repeat", type=int, help="Timed runs per benchmark.")
+    parser.add_argument(
+        "--baseline",
+        type=Path,
+        default=Path("benchmarks.json"),
+        help="Baseline file (default: benchmarks.json).",
+    )
+    parser.add_argument(
+        "--save", action="store_true", help="Store the results as the new baselines."
+    )
+    parser.add_argument("--threshold", type=float, default=0.10)
+    parser.add_argument("--memory-threshold", type=float, default=0.20)
+    parser.add_argument("--json", type=Path, help="Also write the results to this file.")
+    parser.add_argument(
+        "--results",
+        type=Path,
+        help="Take the results from a file written by --json instead of running the benchmarks.",
+    )
+    args = parser.parse_args(argv)
+
+    names = [
+        name
+        for name in BENCHMARKS
+        if not args.patterns or any(pattern in name for pattern in args.patterns)
+    ]
+    if args.list:
+        print("\n".join(names))
+        return 0
+
+    baselines = json.loads(args.baseline.read_text()) if args.baseline.exists() else {}
+    env, recorded = environment(), None
+    if args.results:
+        report = json.loads(args.results.read_text())
+        env, recorded = report["environment"], report["benchmarks"]
+        names = [name for name in names if name in recorded]
+    if baselines.get("environment", env) != env:
+        print(f"Note: baselines were recorded with {baselines['environment']}")
+
+    results, regressions = {}, []
+    context = multiprocessing.get_context("spawn")
+    for name in names:
+        if recorded is not None:
+            result = recorded[name]
+        else:
+            repeat = args.repeat or BENCHMARKS[name][1]
+            # A fresh process per benchmark keeps imports, caches and RSS separate.
+            with ProcessPoolExecutor(1, mp_context=context) as pool:
+                result = pool.submit(
+                    run_benchmark, name, args.deck.resolve(), args.quality, repeat
+                ).result()
+        results[name] = result
+
+        baseline = baselines.get("benchmarks", {}).get(name)
+        status = "new"
+        if baseline and "median" in baseline:
+            found = compare(name, result, baseline, args.threshold, args.memory_threshold)
+            regressions += found
+            status = "REGRESSION" if found else f"{result['median'] / baseline['median']:.2f}x"
+        print(
+            f"{name:<24} median {result['median']:8.3f}s  min {result['min']:8.3f}s  "
+            f"± {result['stdev']:.3f}s  peak {result['peak_rss_mb'] or 0:7.0f} MiB  {status}"
+        )
+
+    report = {"environment": env, "benchmarks": results}
+    if args.json:
+        args.json.write_text(json.dumps(report, indent=2))
+    if args.save:
+        stored = baselines.get("benchmarks", {})
+        for name, result in results.items():
+            # keep thresholds tuned by hand
+            kept = {
+                key: value
+                for key, value in stored.get(name, {}).items()
+                if key in ("threshold", "memory_threshold")
+            }
+            stored[name] = {**result, **kept}
+        args.baseline.write_text(
+            json.dumps({"environment": env, "benchmarks": stored}, indent=2)
+        )
+        print(f"Baselines written to {args.baseline}")
+        return 0
+
+    if regressions:
+        print("\n".join(["", "Regressions:", *regressions]), file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
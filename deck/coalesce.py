@@ -0,0 +1,283 @@
+"""Encode runs of short plays as a single partial movie file.
+
+Every ``self.play`` and ``self.wait`` normally gets its own ffmpeg process,
+its own partial movie file and its own entry in the concat lists, which is
+most of the render time of slides made of many short reveals::
+
+    with self.coalesce():
+        for cell in right_x:
+            self.play(cell.animate.set_color(BLACK), run_time=2 / len(right_x))
+        self.next_slide()
+        ...
+
+Inside :meth:`CoalescingSlide.coalesce`, consecutive plays stream their
+frames into one ffmpeg process, and the whole run counts as one animation
+for manim and Manim Slides. ``next_slide()`` (and leaving the block) closes
+the run, so slide boundaries are unchanged; the frames, hence the timing, are
+exactly those the separate plays would have written.
+
+A run is cached as a whole: its file is named after the hashes of its plays,
+and :class:`~deck.incremental.IncrementalSlide` reuses it with its section.
+Within a render, a run whose first play hashes as that of a run rendered
+before is not drawn while its plays keep matching the hashes recorded with
+that run (in ``coalesced_start_<hash>.json``): they are applied straight to
+their end state, and the earlier file is reused when the run ends with the
+same plays. If a play differs, the frames of the plays skipped so far are
+decoded from the earlier file into the new one, and rendering resumes.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import subprocess
+from contextlib import contextmanager
+from pathlib import Path
+
+import numpy as np
+from manim import config, logger
+from manim.utils.hashing import get_hash_from_play_call
+
+from .sections import SectionedSlide, finish_animations, jump_to_end
+
+
+class _Run:
+    """Plays coalesced so far, up to the next slide."""
+
+    def __init__(self, rendering):
+        self.rendering = rendering
+        self.hashes: list[str | None] = []
+        self.frames: list[int] = []  # frames written by each play
+        self.path: Path | None = None
+        # An earlier run starting with the same play, while this one matches it.
+        self.cached: dict | None = None
+        self.written = 0
+        self.write_frame = None
+
+
+def _run_name(hashes):
+    digest = hashlib.sha256("\0".join(hashes).encode()).hexdigest()
+    return f"coalesced_{digest[:32]}"
+
+
+def _index_path(directory, first_hash):
+    digest = hashlib.sha256(first_hash.encode()).hexdigest()
+    return Path(directory) / f"coalesced_start_{digest[:32]}.json"
+
+
+class CoalescingSlide(SectionedSlide):
+    """A :class:`SectionedSlide` that can merge plays with :meth:`coalesce`."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._coalescing = False
+        self._run: _Run | None = None
+
+    @contextmanager
+    def coalesce(self):
+        """Encode the plays and waits of each slide in this block as one file."""
+        if self._coalescing:
+            yield
+            return
+
+        self._coalescing = True
+        try:
+            yield
+        except BaseException:
+            if self._run is not None and self._run.path is not None:
+                self._close_run_file(self._run)
+                self._run.path.unlink(missing_ok=True)
+            self._run = None
+            raise
+        else:
+            self._flush_run()
+        finally:
+            self._coalescing = False
+
+    def _start_run(self):
+        renderer = self.renderer
+        if self.fast_forwarding:
+            return _Run(rendering=False)
+        if (
+            renderer._original_skipping_status
+            or not config.write_to_movie
+            or config.save_last_frame
+            or config.from_animation_number
+            or not hasattr(renderer.file_writer, "partial_movie_directory")
+        ):
+            return None
+        return _Run(rendering=True)
+
+    def play(self, *args, subcaption=None, subcaption_duration=None, subcaption_offset=0, **kwargs):
+        if self._coalescing and self._run is None:
+            self._run = self._start_run()
+        if self._run is None:
+            return super().play(
+                *args,
+                subcaption=subcaption,
+                subcaption_duration=subcaption_duration,
+                subcaption_offset=subcaption_offset,
+                **kwargs,
+            )
+
+        start_time = self.renderer.time
+        if self._run.rendering:
+            self._render_into_run(*args, **kwargs)
+        else:
+            jump_to_end(self, *args, **kwargs)
+            self._run.hashes.append(None)
+
+        if subcaption:
+            run_time = self.renderer.time - start_time
+            self.add_subcaption(
+                content=subcaption,
+                duration=run_time if subcaption_duration is None else subcaption_duration,
+                offset=-run_time + subcaption_offset,
+            )
+
+    def _render_into_run(self, *args, **kwargs):
+        """Render a play as ``CairoRenderer.play`` does, into the run's file."""
+        renderer = self.renderer
+        run = self._run
+        renderer.skip_animations = False
+        renderer.update_skipping_status()
+        self.compile_animation_data(*args, **kwargs)
+
+        if config.disable_caching:
+            run.hashes.append("uncached")
+        else:
+            run.hashes.append(
+                get_hash_from_play_call(self, self.camera, self.animations, self.mobjects)
+            )
+            if len(run.hashes) == 1:
+                run.cached = self._cached_run(run.hashes[0])
+
+        if run.cached is not None:
+            play = len(run.hashes) - 1
+            if run.cached["hashes"][play : play + 1] == run.hashes[-1:]:
+                # Same play as in the earlier run: its frames are in that file.
+                finish_animations(self)
+                run.frames.append(run.cached["frames"][play])
+                renderer.time += run.frames[-1] / config.frame_rate
+                return
+            self._resume_run(run)
+
+        if run.path is None:
+            self._open_run_file(run)
+        written = run.written
+        self.begin_animations()
+        renderer.save_static_frame_data(self, self.static_mobjects)
+        if self.is_current_animation_frozen_frame():
+            renderer.update_frame(self, mobjects=self.moving_mobjects)
+            renderer.freeze_current_frame(self.duration)
+        else:
+            self.play_internal()
+        run.frames.append(run.written - written)
+
+    def _cached_run(self, first_hash):
+        """The plays and frames of the last run that started with ``first_hash``."""
+        directory = self.renderer.file_writer.partial_movie_directory
+        try:
+            cached = json.loads(_index_path(directory, first_hash).read_text())
+        except (OSError, ValueError):
+            return None
+        file = Path(directory) / f"{_run_name(cached['hashes'])}{config.movie_file_extension}"
+        return cached if file.exists() else None
+
+    def _open_run_file(self, run):
+        file_writer = self.renderer.file_writer
+        run.path = (
+            Path(file_writer.partial_movie_directory)
+            / f"coalescing_{self.renderer.num_plays:05}{config.movie_file_extension}"
+        )
+        file_writer.begin_animation(True, file_path=run.path)
+        run.write_frame = file_writer.write_frame
+
+        def write_frame(frame):
+            run.written += 1
+            run.write_frame(frame)
+
+        file_writer.write_frame = write_frame
+
+    def _close_run_file(self, run):
+        file_writer = self.renderer.file_writer
+        file_writer.write_frame = run.write_frame
+        file_writer.end_animation(True)
+
+    def _resume_run(self, run):
+        """Stop following the earlier run: copy the frames of the plays skipped so far."""
+        cached, run.cached = run.cached, None
+        self._open_run_file(run)
+        count = sum(run.frames)
+        if not count:
+            return
+        directory = self.renderer.file_writer.partial_movie_directory
+        source = Path(directory) / f"{_run_name(cached['hashes'])}{config.movie_file_extension}"
+        width, height = config.pixel_width, config.pixel_height
+        # manim 0.19 dropped the setting along with its ffmpeg pipe.
+        ffmpeg = getattr(config, "ffmpeg_executable", "ffmpeg")
+        command = [ffmpeg, "-loglevel", "error", "-i", str(source), "-frames:v", str(count)]
+        command += ["-f", "rawvideo", "-pix_fmt", "rgba", "-"]
+        with subprocess.Popen(command, stdout=subprocess.PIPE) as decoder:
+            for _ in range(count):
+                data = decoder.stdout.read(width * height * 4)
+                if len(data) < width * height * 4:
+                    raise RuntimeError(f"'{source}' ended before frame {count}")
+                run.write_frame(np.frombuffer(data, np.uint8).reshape(height, width, 4))
+            decoder.stdout.close()
+        if decoder.returncode:
+            raise RuntimeError(f"Could not decode '{source}'")
+
+    def _flush_run(self):
+        """Register the current run as one animation."""
+        run, self._run = self._run, None
+        if run is None or not run.hashes:
+            return
+
+        renderer = self.renderer
+        if not run.rendering:
+            renderer.num_plays += 1
+            if self._replayed_files is not None:
+                self._register_replayed_play()
+            else:
+                renderer.file_writer.add_partial_movie_file(None)
+                renderer.animations_hashes.append(None)
+                self._current_animation += 1
+            return
+
+        file_writer = renderer.file_writer
+        directory = Path(file_writer.partial_movie_directory)
+        if run.cached is not None and len(run.cached["hashes"]) != len(run.hashes):
+            self._resume_run(run)  # a shorter run than the earlier one
+        if config.disable_caching:
+            hash_current_animation = f"uncached_{renderer.num_plays:05}"
+        else:
+            hash_current_animation = _run_name(run.hashes)
+        if run.path is None:
+            logger.info(
+                f"Animation {renderer.num_plays} : Using cached coalesced run "
+                f"'{hash_current_animation}'"
+            )
+        else:
+            self._close_run_file(run)
+            file = directory / f"{hash_current_animation}{config.movie_file_extension}"
+            os.replace(run.path, file)
+            if not config.disable_caching:
+                index = _index_path(directory, run.hashes[0])
+                partial = index.with_name(f".{index.name}")
+                partial.write_text(json.dumps({"hashes": run.hashes, "frames": run.frames}))
+                os.replace(partial, index)
+
+        file_writer.add_partial_movie_file(hash_current_animation)
+        renderer.animations_hashes.append(hash_current_animation)
+        renderer.num_plays += 1
+        self._current_animation += 1
+
+    def next_slide(self, *args, **kwargs):
+        self._flush_run()
+        coalescing, self._coalescing = self._coalescing, False
+        try:
+            super().next_slide(*args, **kwargs)
+        finally:
+            self._coalescing = coalescing
@@ -0,0 +1,287 @@
+"""A render server that keeps manim imported between renders.
+
+Usage::
+
+    python -m deck.daemon serve &
+    python -m deck.daemon render intuitive_limits.py TeachingDemo -ql
+    python -m deck.daemon render intuitive_limits.py TeachingDemo -ql \\
+        --sections construct_limit_difference
+    python -m deck.daemon stop
+
+Running ``manim`` starts by importing manim, Manim Slides, NumPy, Cairo and
+Pango, which takes several seconds before the first frame. ``serve`` pays
+that once, and ``render`` sends the scene file, scene name and options to
+the server over a local socket (``$DECK_CACHE_DIR/daemon.sock``), then waits
+for it to finish. The render logs are printed by the server.
+
+For each request, the scene file is executed again, in a fresh manim
+``config``. The modules it imports from its own directory (such as
+:mod:`deck`) are kept, unless one of their files changed since they were
+imported, in which case they are all imported again; third-party modules are
+never reloaded. Defaults changed with ``set_default``, the mobjects of
+:mod:`deck.geometry` and the glyphs of :mod:`deck.readout` are reset after
+each render.
+
+``--sections FIRST[:LAST]`` renders only that range of a
+:class:`~deck.sections.SectionedSlide`, by name or index: the sections
+before it are fast-forwarded and the ones after it are left out. The
+presentation written to ``slides/`` then starts at the first slide of the
+range, as with manim's ``-n``. ``--draft TARGET`` renders a draft instead
+(see :mod:`deck.draft`).
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import time
+import traceback
+from multiprocessing.connection import Client, Listener
+from pathlib import Path
+
+from manim import Mobject, Text, config, logger, tempconfig
+
+from .glyph_cache import cache_dir
+from .runner import add_scene_arguments, configure, load_scene, render_options
+
+
+def daemon_address():
+    """Address and key of the server."""
+    directory = cache_dir()
+    key = directory / "daemon.key"
+    if sys.platform == "win32":
+        return ("localhost", 47813), key
+    return str(directory / "daemon.sock"), key
+
+
+def _subclasses(cls):
+    for subclass in cls.__subclasses__():
+        yield subclass
+        yield from _subclasses(subclass)
+
+
+def reset_defaults():
+    """Undo ``set_default`` on every mobject class."""
+    for cls in _subclasses(Mobject):
+        original = cls.__dict__.get("_original__init__")
+        if original is not None and cls.__dict__.get("__init__") is not original:
+            cls.__init__ = original
+
+
+def clear_caches():
+    """Empty the caches of the ``deck`` modules currently imported.
+
+    A render that reloads ``deck`` leaves the modules imported here behind:
+    the scene uses the new copies in ``sys.modules``, so those are cleared.
+    """
+    geometry = sys.modules.get(f"{__package__}.geometry")
+    if geometry is not None:
+        geometry.clear()
+    readout = sys.modules.get(f"{__package__}.readout")
+    if readout is not None:
+        readout.clear()
+    incremental = sys.modules.get(f"{__package__}.incremental")
+    if incremental is not None:
+        incremental.static_fingerprints.cache_clear()
+
+
+class RenderServer:
+    """Renders scenes on request, reusing the modules already imported."""
+
+    def __init__(self):
+        self._mtimes: dict[str, int] = {}
+
+    def _local_modules(self, file):
+        """Modules imported from the directory of ``file``, except ``file`` itself."""
+        file = Path(file).resolve()
+        for name, module in list(sys.modules.items()):
+            path = getattr(module, "__file__", None)
+            if name == "__main__" or not path or "site-packages" in Path(path).parts:
+                continue
+            path = Path(path).resolve()
+            if path != file and path.is_relative_to(file.parent):
+                yield name, path
+
+    def forget_changed_modules(self, file):
+        """Drop the modules next to ``file`` from ``sys.modules`` if any changed."""
+        modules = dict(self._local_modules(file))
+        changed = sorted(
+            name
+            for name, path in modules.items()
+            if name in self._mtimes
+            and os.stat(path).st_mtime_ns != self._mtimes[name]
+        )
+        if changed:
+            # Modules importing a changed one hold references to it: reload all.
+            for name in modules:
+                del sys.modules[name]
+                self._mtimes.pop(name, None)
+        return changed
+
+    def _record_modules(self, file):
+        for name, path in self._local_modules(file):
+            self._mtimes.setdefault(name, os.stat(path).st_mtime_ns)
+
+    def render(self, file, scene_name, options, sections=None, draft=None):
+        """Render ``scene_name`` from ``file``; return the names of reloaded modules."""
+        reloaded = self.forget_changed_modules(file)
+        clear_caches()
+        environment = dict(os.environ)
+        if draft:
+            os.environ["DECK_DRAFT"] = draft
+        try:
+            with tempconfig({}):
+                configure(options)
+                scene_cls = load_scene(file, scene_name)
+                self._record_modules(file)
+                scene = scene_cls()
+                if sections is not None:
+                    _restrict_to_sections(scene, sections)
+                scene.render()
+        finally:
+            reset_defaults()
+            clear_caches()
+            os.environ.clear()
+            os.environ.update(environment)
+        return reloaded
+
+    def serve(self):
+        address, key_file = daemon_address()
+        key_file.parent.mkdir(parents=True, exist_ok=True)
+        key = os.urandom(32)
+        key_file.write_bytes(key)
+        key_file.chmod(0o600)
+        if isinstance(address, str) and os.path.exists(address):
+            os.unlink(address)
+
+        # Load what every render needs: fonts and Pango come up with a first Text.
+        Text("0")
+        logger.info(f"Render server listening on {address}")
+        with Listener(address, authkey=key) as listener:
+            while True:
+                with listener.accept() as connection:
+                    request = connection.recv()
+                    if request.get("command") == "stop":
+                        connection.send({"ok": True})
+                        break
+                    connection.send(self._handle(request))
+
+    def _handle(self, request):
+        start = time.perf_counter()
+        cwd = os.getcwd()
+        # Renders write media/ and slides/ relative to the client's directory.
+        os.chdir(request["cwd"])
+        try:
+            reloaded = self.render(
+                request["file"],
+                request["scene"],
+                request["options"],
+                sections=request.get("sections"),
+                draft=request.get("draft"),
+            )
+        except (Exception, SystemExit):
+            return {"ok": False, "error": traceback.format_exc()}
+        finally:
+            os.chdir(cwd)
+        return {"ok": True, "seconds": time.perf_counter() - start, "reloaded": reloaded}
+
+
+def _section_index(sections, key):
+    if key.lstrip("-").isdigit():
+        return range(len(sections))[int(key)]
+    try:
+        return sections.index(key)
+    except ValueError:
+        raise ValueError(f"No section named {key!r}") from None
+
+
+def _restrict_to_sections(scene, sections):
+    """Make ``scene`` render only the sections ``FIRST[:LAST]``."""
+    first, _, last = sections.partition(":")
+    names = scene.sections
+    start = _section_index(names, first)
+    stop = _section_index(names, last or first) + 1
+
+    offset = 0
+
+    def construct():
+        nonlocal offset
+        for name in names[:start]:
+            scene.fast_forward_section(name)
+        offset = scene.renderer.num_plays
+        for name in names[start:stop]:
+            scene.run_section(name)
+
+    def tear_down():
+        # Only now, so that the range is rendered (and cached) as in a full
+        # render; Manim Slides then drops the slides of the skipped plays.
+        config.from_animation_number = offset
+        tear_down_scene()
+
+    tear_down_scene = scene.tear_down
+    scene.construct = construct
+    scene.tear_down = tear_down
+
+
+def send(request):
+    address, key_file = daemon_address()
+    try:
+        key = key_file.read_bytes()
+        with Client(address, authkey=key) as connection:
+            connection.send(request)
+            return connection.recv()
+    except (FileNotFoundError, ConnectionRefusedError):
+        raise SystemExit(
+            "No render server is running; start one with 'python -m deck.daemon serve'"
+        ) from None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m deck.daemon", description=__doc__.splitlines()[0]
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("serve", help="Start the server in this terminal.")
+    commands.add_parser("stop", help="Stop the running server.")
+    render = commands.add_parser("render", help="Render a scene with the running server.")
+    add_scene_arguments(render)
+    only = render.add_mutually_exclusive_group()
+    only.add_argument(
+        "--sections",
+        metavar="FIRST[:LAST]",
+        help="Only render this range of sections (names or indices).",
+    )
+    only.add_argument(
+        "--draft",
+        metavar="TARGET",
+        help="Render a draft of a slide or section, as DECK_DRAFT (see deck/draft.py).",
+    )
+    args = parser.parse_args(argv)
+
+    if args.command == "serve":
+        RenderServer().serve()
+    elif args.command == "stop":
+        send({"command": "stop"})
+    else:
+        response = send(
+            {
+                "command": "render",
+                "cwd": os.getcwd(),
+                "file": str(args.file.resolve()),
+                "scene": args.scene,
+                "options": render_options(args),
+                "sections": args.sections,
+                "draft": args.draft,
+            }
+        )
+        if not response["ok"]:
+            print(response["error"], file=sys.stderr)
+            raise SystemExit(1)
+        if response["reloaded"]:
+            print(f"Reloaded {', '.join(response['reloaded'])}")
+        print(f"Rendered {args.scene} in {response['seconds']:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,241 @@
+"""Draft renders of a few slides, deep into a deck.
+
+Usage::
+
+    python -m deck.draft intuitive_limits.py TeachingDemo 25
+    python -m deck.draft intuitive_limits.py TeachingDemo 25 -n 3
+    python -m deck.draft intuitive_limits.py TeachingDemo construct_summary
+    manim-slides present --folder slides/draft TeachingDemo
+
+or ``DECK_DRAFT=25+3 manim -ql intuitive_limits.py TeachingDemo``.
+
+A :class:`DraftSlide` with ``DECK_DRAFT`` set renders only its target, a
+slide number (1-based, as ``manim-slides present`` counts them) with an
+optional ``+count`` of slides, or the name of a section. Everything before
+the target is fast-forwarded: each play is applied to its end state without
+being rasterized or encoded. Everything after it is left out.
+
+The target is rendered at most 360 pixels high and 10 frames per second,
+in one process (no frame splitting) and without the section cache of
+:class:`~deck.incremental.IncrementalSlide`. The presentation goes to
+``slides/draft`` so that the full deck in ``slides/`` is left alone. The
+resolution and frame rate of ``config`` are restored once it is rendered.
+
+``Tex`` and ``MathTex`` expressions that LaTeX has not compiled yet are drawn
+as grey boxes, about one per glyph, instead of running LaTeX; those already
+in manim's TeX directory, or in the glyph cache, are drawn as usual. Set
+``DECK_DRAFT_TEX=0`` to run LaTeX anyway.
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import re
+from pathlib import Path
+
+from manim import config, logger
+from manim.mobject.text import tex_mobject
+from manim.utils.tex_file_writing import generate_tex_file
+
+from . import glyph_cache
+from .runner import add_scene_arguments, configure, load_scene, render_options
+from .sections import SectionedSlide
+
+DRAFT_HEIGHT = 360
+DRAFT_FRAME_RATE = 10
+
+# Placeholder geometry, in the units of dvisvgm's output (TeX points).
+_GLYPH_WIDTH, _GLYPH_HEIGHT, _GLYPH_ADVANCE, _LINE_HEIGHT = 5, 7, 6, 12
+
+
+class _DraftDone(Exception):
+    """Raised once the last slide of the draft has been played."""
+
+
+def parse_target(value):
+    """Split ``DECK_DRAFT`` into ``(section, None)`` or ``(None, (first, stop))``."""
+    target, plus, count = value.partition("+")
+    if not target.isdigit():
+        if plus:
+            raise ValueError(f"Section drafts take no slide count: {value!r}")
+        return target, None
+    first = int(target)
+    if first < 1:
+        raise ValueError(f"Slides are numbered from 1: {value!r}")
+    return None, (first, first + int(count or 1))
+
+
+def _placeholder_svg(expression):
+    """An SVG with a grey box for each glyph ``expression`` roughly has."""
+    rects = []
+    for row, line in enumerate(re.split(r"\\\\", expression)):
+        # A command (\frac, \lim, ...) counts as one glyph, grouping and
+        # script markers as none, and spaces only move the next glyph.
+        x = 0
+        for char in re.sub(r"[{}^_$&]", "", re.sub(r"\\[a-zA-Z]+|\\.", "#", line)):
+            if not char.isspace():
+                rects.append(
+                    f'<rect x="{x}" y="{row * _LINE_HEIGHT}" '
+                    f'width="{_GLYPH_WIDTH}" height="{_GLYPH_HEIGHT}" fill="#888"/>'
+                )
+            x += _GLYPH_ADVANCE
+    return f'<svg xmlns="http://www.w3.org/2000/svg">{"".join(rects)}</svg>'
+
+
+def placeholder_tex_to_svg_file(expression, environment=None, tex_template=None):
+    """``tex_to_svg_file``, drawing placeholders instead of running LaTeX."""
+    tex_file = generate_tex_file(expression, environment, tex_template or config.tex_template)
+    svg_file = tex_file.with_suffix(".svg")
+    if svg_file.exists():
+        return svg_file
+
+    glyph_cache.skip_store()
+    placeholder = tex_file.parent / "draft" / svg_file.name
+    if not placeholder.exists():
+        placeholder.parent.mkdir(exist_ok=True)
+        placeholder.write_text(_placeholder_svg(expression))
+    return placeholder
+
+
+class DraftSlide(SectionedSlide):
+    """A :class:`SectionedSlide` that renders only the ``DECK_DRAFT`` target."""
+
+    def __init__(self, *args, **kwargs):
+        self.draft = os.environ.get("DECK_DRAFT") or None
+        self._draft_section, self._draft_slides = (
+            parse_target(self.draft) if self.draft else (None, None)
+        )
+        # Set until render() ends, for the camera and the file writer only.
+        self._draft_config = {}
+        if self.draft:
+            self._draft_config = {
+                "pixel_width": config.pixel_width,
+                "pixel_height": config.pixel_height,
+                "frame_rate": config.frame_rate,
+            }
+            # Before the camera and the file writer are created.
+            height = min(config.pixel_height, DRAFT_HEIGHT)
+            config.pixel_width = round(config.pixel_width * height / config.pixel_height / 2) * 2
+            config.pixel_height = height
+            config.frame_rate = min(config.frame_rate, DRAFT_FRAME_RATE)
+        try:
+            super().__init__(*args, **kwargs)
+        except BaseException:
+            self._restore_config()
+            raise
+        if self.draft:
+            self._output_folder = Path(self._output_folder) / "draft"
+        self._draft_seeking = self._draft_slides is not None and self._draft_slides[0] > 1
+        self._draft_offset = 0
+        self._draft_done = False
+
+    def _restore_config(self):
+        """Undo the draft resolution and frame rate set by ``__init__``."""
+        for key, value in self._draft_config.items():
+            setattr(config, key, value)
+
+    @property
+    def frame_jobs(self):
+        # Drafts are short and small: they are rasterized in this process.
+        return 0 if self.draft else getattr(super(), "frame_jobs", 0)
+
+    def setup(self):
+        super().setup()
+        if self.draft:
+            # Sections are fast-forwarded or rendered here, never replayed.
+            self.incremental = False
+
+    def render(self, *args, **kwargs):
+        if not self.draft:
+            return super().render(*args, **kwargs)
+
+        tex_to_svg_file = tex_mobject.tex_to_svg_file
+        from_animation_number = config.from_animation_number
+        if os.environ.get("DECK_DRAFT_TEX", "1") != "0":
+            tex_mobject.tex_to_svg_file = placeholder_tex_to_svg_file
+        try:
+            super().render(*args, **kwargs)
+        finally:
+            tex_mobject.tex_to_svg_file = tex_to_svg_file
+            config.from_animation_number = from_animation_number
+            self._restore_config()
+        logger.info(
+            f"Draft of {self.draft} written to '{self._output_folder}'; "
+            f"view it with 'manim-slides present --folder {self._output_folder} {self}'"
+        )
+
+    def run_section(self, name):
+        if not self.draft:
+            return super().run_section(name)
+        if self._draft_done:
+            return
+
+        if self._draft_section is not None:
+            if name != self._draft_section:
+                return self.fast_forward_section(name)
+            self._draft_offset = self._current_animation
+            super().run_section(name)
+            self._draft_done = True
+            return
+
+        if self._draft_seeking:
+            self._replayed_files, self._replayed_count = [], 0
+        try:
+            super().run_section(name)
+        except _DraftDone:
+            self._draft_done = True
+        finally:
+            if self._draft_seeking:
+                self._replayed_files = None
+
+    def next_slide(self, *args, **kwargs):
+        super().next_slide(*args, **kwargs)
+        if self._draft_slides is None:
+            return
+        first, stop = self._draft_slides
+        if self._draft_seeking and self._current_slide == first:
+            # The target starts here: render from now on.
+            self._draft_seeking = False
+            self._replayed_files = None
+            self._draft_offset = self._current_animation
+        elif self._current_slide >= stop:
+            raise _DraftDone
+
+    def tear_down(self):
+        if self.draft:
+            if self._draft_seeking or (self._draft_section and not self._draft_done):
+                raise ValueError(f"{type(self).__name__} has no slide or section {self.draft}")
+            # Manim Slides drops the slides of the fast-forwarded plays.
+            config.from_animation_number = self._draft_offset
+        super().tear_down()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m deck.draft", description=__doc__.splitlines()[0]
+    )
+    add_scene_arguments(parser)
+    parser.set_defaults(quality="l")
+    parser.add_argument("target", help="Slide number (from 1) or section name to render.")
+    parser.add_argument(
+        "-n", "--count", type=int, default=1, help="Number of slides to render (default: 1)."
+    )
+    parser.add_argument(
+        "--latex",
+        action="store_true",
+        help="Run LaTeX for uncompiled TeX instead of drawing placeholders.",
+    )
+    args = parser.parse_args(argv)
+
+    target = args.target if args.count == 1 else f"{args.target}+{args.count}"
+    parse_target(target)
+    os.environ["DECK_DRAFT"] = target
+    if args.latex:
+        os.environ["DECK_DRAFT_TEX"] = "0"
+    configure(render_options(args))
+    load_scene(args.file, args.scene)().render()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,180 @@
+"""Split the frames of long animations across worker processes.
+
+A single ``self.play`` is normally rasterized frame after frame on one core:
+the 5-second ``ValueTracker`` sweeps are hundreds of Cairo frames each at 60
+fps, and many more in 4K. With :class:`FrameSplitSlide`, a play call of at
+least ``$DECK_SPLIT_MIN_FRAMES`` frames (180 by default) that is not already
+in manim's cache is cut into contiguous frame ranges, one per worker.
+
+Each worker imports the scene again, fast-forwards every earlier play to
+rebuild the state the animation starts from, steps the animation through the
+frames before its range without drawing them, and rasterizes and encodes its
+own range with manim's usual ffmpeg settings. The chunks are then joined by
+stream copy (no re-encoding) into the partial movie file manim would have
+written, and the parent jumps the animation to its end state.
+
+Set ``DECK_FRAME_JOBS`` to the number of workers to enable it (off by
+default). It only applies to the Cairo renderer writing a movie.
+"""
+
+from __future__ import annotations
+
+import multiprocessing
+import os
+import shutil
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+from manim import Wait, config, logger
+from manim.utils.hashing import get_hash_from_play_call
+from manim_slides.utils import concatenate_video_files
+
+from .runner import configure, load_scene, snapshot_options
+from .sections import SectionedSlide, fast_forward
+
+
+class _ChunkRendered(Exception):
+    """Stops a worker's scene once its chunk is written."""
+
+
+def render_chunk(file, scene_name, options, play_index, frames, chunk_file):
+    """Rasterize ``frames`` (a ``range`` of frame indices) of play ``play_index``."""
+    configure(options)
+    scene = load_scene(file, scene_name)()
+    scene._frame_job = (play_index, frames, chunk_file)
+    scene.setup()
+    scene.incremental = False
+    try:
+        scene.construct()
+    except _ChunkRendered:
+        return chunk_file
+    raise RuntimeError(f"{scene_name} played fewer than {play_index + 1} animations")
+
+
+class FrameSplitSlide(SectionedSlide):
+    """A :class:`SectionedSlide` that rasterizes long animations in parallel."""
+
+    _frame_job = None
+
+    @property
+    def fast_forwarding(self):
+        return super().fast_forwarding or self._frame_job is not None
+
+    @property
+    def frame_jobs(self):
+        return int(os.environ.get("DECK_FRAME_JOBS", 0))
+
+    def play(self, *args, subcaption=None, subcaption_duration=None, subcaption_offset=0, **kwargs):
+        renderer = self.renderer
+        if self._frame_job is not None:
+            return self._play_in_worker(*args, **kwargs)
+
+        if (
+            self.frame_jobs < 2
+            or self._replayed_files is not None
+            or renderer._original_skipping_status
+            or not config.write_to_movie
+            or config.save_last_frame
+            or config.from_animation_number
+            or not hasattr(renderer.file_writer, "partial_movie_directory")
+        ):
+            return super().play(
+                *args,
+                subcaption=subcaption,
+                subcaption_duration=subcaption_duration,
+                subcaption_offset=subcaption_offset,
+                **kwargs,
+            )
+
+        # Compile once: the animations (not the builders) are reused below.
+        animations = self.compile_animations(*args, **kwargs)
+        run_time = self.get_run_time(animations)
+        num_frames = len(np.arange(0, run_time, 1 / config.frame_rate))
+        split = (
+            num_frames >= int(os.environ.get("DECK_SPLIT_MIN_FRAMES", 180))
+            and not (len(animations) == 1 and isinstance(animations[0], Wait))
+        )
+        if split:
+            self.compile_animation_data(*animations)
+            if config.disable_caching:
+                hash_current_animation = f"uncached_{renderer.num_plays:05}"
+            else:
+                hash_current_animation = get_hash_from_play_call(
+                    self, self.camera, self.animations, self.mobjects
+                )
+            split = not renderer.file_writer.is_already_cached(hash_current_animation)
+
+        if not split:
+            return super().play(
+                *animations,
+                subcaption=subcaption,
+                subcaption_duration=subcaption_duration,
+                subcaption_offset=subcaption_offset,
+            )
+
+        self._render_split(hash_current_animation, num_frames)
+        renderer.file_writer.add_partial_movie_file(hash_current_animation)
+        renderer.animations_hashes.append(hash_current_animation)
+        fast_forward(self, *animations)
+        self._current_animation += 1
+
+    def _render_split(self, hash_current_animation, num_frames):
+        file_writer = self.renderer.file_writer
+        jobs = min(self.frame_jobs, num_frames)
+        bounds = [round(i * num_frames / jobs) for i in range(jobs + 1)]
+        destination = (
+            Path(file_writer.partial_movie_directory)
+            / f"{hash_current_animation}{config.movie_file_extension}"
+        )
+        logger.info(
+            f"Animation {self.renderer.num_plays}: rasterizing {num_frames} frames "
+            f"with {jobs} processes"
+        )
+
+        chunks_dir = Path(tempfile.mkdtemp(dir=file_writer.partial_movie_directory))
+        try:
+            context = multiprocessing.get_context("spawn")
+            with ProcessPoolExecutor(jobs, mp_context=context) as pool:
+                futures = [
+                    pool.submit(
+                        render_chunk,
+                        config.input_file,
+                        type(self).__name__,
+                        snapshot_options(),
+                        self.renderer.num_plays,
+                        range(start, stop),
+                        str(chunks_dir / f"{i:04}{config.movie_file_extension}"),
+                    )
+                    for i, (start, stop) in enumerate(zip(bounds, bounds[1:]))
+                ]
+                chunks = [Path(future.result()) for future in futures]
+            concatenate_video_files(chunks, destination)
+        finally:
+            shutil.rmtree(chunks_dir, ignore_errors=True)
+
+    def _play_in_worker(self, *args, **kwargs):
+        play_index, frames, chunk_file = self._frame_job
+        renderer = self.renderer
+
+        if renderer.num_plays < play_index:
+            fast_forward(self, *args, **kwargs)
+            renderer.file_writer.add_partial_movie_file(None)
+            self._current_animation += 1
+            return
+
+        self.compile_animation_data(*args, **kwargs)
+        self.begin_animations()
+        renderer.save_static_frame_data(self, self.static_mobjects)
+        renderer.file_writer.begin_animation(True, file_path=chunk_file)
+
+        times = np.arange(0, self.duration, 1 / config.frame_rate)
+        for index, t in enumerate(times[: frames.stop]):
+            self.update_to_time(t)
+            if index >= frames.start:
+                renderer.render(self, t, self.moving_mobjects)
+
+        renderer.file_writer.end_animation(True)
+        raise _ChunkRendered
+
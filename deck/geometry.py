@@ -0,0 +1,149 @@
+"""Build axes and graphs once, hand out copies.
+
+Sections that show the same picture again build it again::
+
+    ax = Axes(x_range=[-3, 3, 1], y_range=[0, 6, 1], tips=False).to_edge(RIGHT)
+    graph = FunctionPlot(ax, lambda x: (x**3 - 1) / (x - 1), x_range=[-2, 2, 1])
+
+With ``include_numbers`` (set for the whole deck by ``Axes.set_default``),
+each ``Axes`` lays out and parses one ``MathTex`` per tick label, and each
+graph samples its function again. The factories of this module keep the
+first object built for a set of arguments and return a copy of it for every
+later call with the same arguments::
+
+    ax = cached_axes(x_range=[-3, 3, 1], y_range=[0, 6, 1], tips=False).to_edge(RIGHT)
+    graph = cached_function_plot(ax, lambda x: (x**3 - 1) / (x - 1), x_range=[-2, 2, 1])
+
+Mobjects are keyed by their class, their arguments and the defaults set with
+``set_default``. Graphs are also keyed by the function and by where the axes
+put the coordinates on screen, so moving or scaling the axes before plotting
+is fine. Two functions are the same if their code, constants, default
+arguments and closure variables are (``lambda`` expressions written twice
+are); arguments without a stable ``repr`` make the call uncached.
+
+The copies are plain ``Mobject.copy()`` clones: manim updates point arrays
+in place (``points -= about_point`` when scaling or rotating), so they
+cannot share them with the cached original. Copying arrays is still far
+cheaper than the text layout and sampling it replaces.
+"""
+
+from __future__ import annotations
+
+import copy
+import types
+
+import numpy as np
+from manim import Axes, Mobject, NumberLine
+
+from .glyph_cache import Uncacheable, _key_repr
+from .plotting import FunctionPlot
+
+_built: dict[str, object] = {}
+
+
+def clear():
+    """Forget every cached mobject."""
+    _built.clear()
+
+
+def _code_key(code):
+    consts = tuple(
+        _code_key(const) if isinstance(const, types.CodeType) else repr(const)
+        for const in code.co_consts
+    )
+    return repr((code.co_code, consts, code.co_names, code.co_varnames))
+
+
+def _function_key(function):
+    if not isinstance(function, types.FunctionType):
+        return _key_repr(function)
+    closure = tuple(cell.cell_contents for cell in function.__closure__ or ())
+    return "\0".join(
+        (
+            _code_key(function.__code__),
+            _key_repr(function.__defaults__),
+            _key_repr(function.__kwdefaults__),
+            _key_repr(closure),
+        )
+    )
+
+
+def _axes_key(ax):
+    """Where ``ax`` puts coordinates on screen."""
+    samples = [ax.coords_to_point(x, y) for x in (0, 1, 2) for y in (0, 1, 2)]
+    return _key_repr(
+        (type(ax).__name__, np.round(np.array(samples), 9).tolist(), ax.x_range, ax.y_range)
+    )
+
+
+def _defaults():
+    """The defaults of every mobject class changed with ``set_default``."""
+    defaults, classes = {}, [Mobject]
+    while classes:
+        cls = classes.pop()
+        classes += cls.__subclasses__()
+        keywords = getattr(cls.__dict__.get("__init__"), "keywords", None)
+        if keywords:
+            defaults[f"{cls.__module__}.{cls.__qualname__}"] = keywords
+    return defaults
+
+
+def _cached(key_parts, build, shared=None):
+    """A copy of the cached result of ``build()`` for ``key_parts()``.
+
+    ``shared(original)`` maps the ids of objects the copy should refer to
+    instead of copying them to their replacements.
+    """
+    try:
+        key = "\0".join(key_parts())
+    except Uncacheable:
+        return build()
+    if key not in _built:
+        _built[key] = build()
+    original = _built[key]
+    return copy.deepcopy(original, shared(original) if shared else None)
+
+
+def cached_axes(*args, **kwargs):
+    """``Axes(*args, **kwargs)``, built once."""
+    return _cached(
+        lambda: ("Axes", _key_repr((args, kwargs, _defaults()))),
+        lambda: Axes(*args, **kwargs),
+    )
+
+
+def cached_number_line(*args, **kwargs):
+    """``NumberLine(*args, **kwargs)``, built once."""
+    return _cached(
+        lambda: ("NumberLine", _key_repr((args, kwargs, _defaults()))),
+        lambda: NumberLine(*args, **kwargs),
+    )
+
+
+def cached_plot(ax, function, **kwargs):
+    """``ax.plot(function, **kwargs)``, sampled once."""
+    graph = _cached(
+        lambda: ("plot", _axes_key(ax), _function_key(function), _key_repr((kwargs, _defaults()))),
+        lambda: ax.plot(function, **kwargs),
+        # The copy plots the caller's function, not the cached one.
+        lambda graph: {id(graph.underlying_function): function},
+    )
+    # ``graph.function`` (used by ``input_to_graph_point`` and the like) is a
+    # lambda closing over the axes of the first call: rebuild it on ``ax``.
+    graph.function = lambda t: ax.coords_to_point(t, function(t))
+    return graph
+
+
+def cached_function_plot(ax, function, **kwargs):
+    """``FunctionPlot(ax, function, **kwargs)``, sampled once."""
+    return _cached(
+        lambda: (
+            "FunctionPlot",
+            _axes_key(ax),
+            _function_key(function),
+            _key_repr((kwargs, _defaults())),
+        ),
+        lambda: FunctionPlot(ax, function, **kwargs),
+        # The copy refers to the caller's axes and function, not to copies of them.
+        lambda graph: {id(graph.ax): ax, id(graph.underlying_function): function},
+    )
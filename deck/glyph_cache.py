@@ -0,0 +1,253 @@
+"""Persistent cache of laid out ``Text``, ``MarkupText`` and TeX mobjects.
+
+manim keeps the SVG files produced by Pango and LaTeX + dvisvgm, but every
+render still parses them again and rebuilds the glyph mobjects, and a fresh
+media directory (e.g. in CI) runs LaTeX once per expression. After
+:func:`install`, the complete state of each such mobject is pickled into a
+content-addressed store, keyed by its class, its constructor arguments
+(string, font, size, slant, weight, ``t2c``, ``t2s``, ...), the defaults set
+with ``set_default``, the TeX template and the manim version. Constructing
+the same mobject again, in this or any later run, restores it from the store
+without touching Pango, LaTeX or the SVG parser.
+
+The store lives in ``$DECK_CACHE_DIR/glyphs`` (``~/.cache/deck/glyphs`` by
+default) so it is shared between decks. It is capped at
+``$DECK_GLYPH_CACHE_MB`` megabytes (256 by default), evicting the least
+recently used entries first. Set ``DECK_GLYPH_CACHE=0`` to disable it.
+"""
+
+from __future__ import annotations
+
+import atexit
+import functools
+import hashlib
+import os
+import pickle
+import tempfile
+from collections import OrderedDict
+from functools import partialmethod
+from pathlib import Path
+
+import manim
+from manim import MarkupText, MathTex, SingleStringMathTex, Tex, Text, config, logger
+
+CACHED_CLASSES = (Text, MarkupText, SingleStringMathTex, MathTex, Tex)
+
+
+def cache_dir():
+    """Root directory of the caches shared between decks."""
+    return Path(os.environ.get("DECK_CACHE_DIR", Path.home() / ".cache" / "deck"))
+
+
+class Uncacheable(Exception):
+    """Raised when a constructor argument has no stable representation."""
+
+
+def _key_repr(value):
+    if isinstance(value, dict):
+        items = sorted(value.items(), key=str)
+        return "{" + ", ".join(f"{_key_repr(k)}: {_key_repr(v)}" for k, v in items) + "}"
+    if isinstance(value, (list, tuple)):
+        return "(" + ", ".join(_key_repr(v) for v in value) + ")"
+    if hasattr(value, "body") and hasattr(value, "placeholder_text"):  # TexTemplate
+        return f"TexTemplate({value.body!r})"
+    text = repr(value)
+    if " at 0x" in text:
+        raise Uncacheable(text)
+    return text
+
+
+class GlyphCache:
+    """A size-capped, least-recently-used store of pickled mobject states."""
+
+    def __init__(self, directory, max_bytes, memory_entries=512):
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._memory: OrderedDict[str, bytes] = OrderedDict()
+        self._memory_entries = memory_entries
+        self._index: dict[Path, tuple[float, int]] | None = None
+
+    def _path(self, key):
+        return self.directory / key[:2] / f"{key}.pickle"
+
+    def _load_index(self):
+        if self._index is None:
+            self._index = {}
+            for path in self.directory.glob("*/*.pickle"):
+                stat = path.stat()
+                self._index[path] = (stat.st_mtime, stat.st_size)
+        return self._index
+
+    def _remember(self, key, data):
+        self._memory[key] = data
+        self._memory.move_to_end(key)
+        while len(self._memory) > self._memory_entries:
+            self._memory.popitem(last=False)
+
+    def get(self, key):
+        """Return the pickled state stored under ``key``, or ``None``."""
+        path = self._path(key)
+        data = self._memory.get(key)
+        if data is None:
+            try:
+                data = path.read_bytes()
+            except OSError:
+                self.misses += 1
+                return None
+            self._remember(key, data)
+        self._touch(path, len(data))
+        self.hits += 1
+        return data
+
+    def _touch(self, path, size):
+        """Mark ``path`` as just used, on disk and in the eviction index."""
+        try:
+            os.utime(path)
+        except OSError:  # evicted by another process; it is only in memory now
+            return
+        if self._index is not None:
+            self._index[path] = (path.stat().st_mtime, size)
+
+    def put(self, key, data):
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with tempfile.NamedTemporaryFile(dir=path.parent, delete=False) as file:
+            file.write(data)
+        os.replace(file.name, path)
+        self._remember(key, data)
+
+        index = self._load_index()
+        index[path] = (path.stat().st_mtime, len(data))
+        self.evict()
+
+    def evict(self):
+        """Delete least recently used entries until the store fits its cap."""
+        index = self._load_index()
+        total = sum(size for _, size in index.values())
+        if total <= self.max_bytes:
+            return
+        for path, (_, size) in sorted(index.items(), key=lambda item: item[1][0]):
+            if total <= 0.9 * self.max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            del index[path]
+            total -= size
+
+    def stats(self):
+        requests = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / requests if requests else 0.0,
+        }
+
+
+_cache: GlyphCache | None = None
+_building = 0  # depth of cached constructors currently running
+_skip_store = False  # set by skip_store() while a cached constructor runs
+
+
+def get_cache():
+    global _cache
+    if _cache is None:
+        _cache = GlyphCache(
+            cache_dir() / "glyphs",
+            max_bytes=float(os.environ.get("DECK_GLYPH_CACHE_MB", 256)) * 2**20,
+        )
+    return _cache
+
+
+def skip_store():
+    """Keep the mobject being built out of the store (e.g. a draft placeholder)."""
+    global _skip_store
+    _skip_store = True
+
+
+def _cache_key(cls, args, kwargs):
+    parts = [
+        manim.__version__,
+        f"{cls.__module__}.{cls.__qualname__}",
+        _key_repr(args),
+        _key_repr(kwargs),
+    ]
+    if issubclass(cls, SingleStringMathTex) and kwargs.get("tex_template") is None:
+        parts.append(_key_repr(config.tex_template))
+    return hashlib.sha256("\0".join(parts).encode()).hexdigest()
+
+
+def _cached_init(cls, init):
+    @functools.wraps(init)
+    def __init__(self, *args, **kwargs):  # noqa: N807
+        global _building, _skip_store
+        # Only whole objects of exactly this class are cached: when called
+        # through ``super()``, the rest of the subclass __init__ has to run.
+        if _building or type(self) is not cls:
+            _building += 1
+            try:
+                return init(self, *args, **kwargs)
+            finally:
+                _building -= 1
+
+        cache = get_cache()
+        try:
+            key = _cache_key(cls, args, kwargs)
+        except Uncacheable:
+            key = None
+
+        if key is not None and (data := cache.get(key)) is not None:
+            self.__dict__.update(pickle.loads(data))
+            return
+
+        _building += 1
+        _skip_store = False
+        try:
+            init(self, *args, **kwargs)
+        finally:
+            _building -= 1
+
+        if key is not None and not _skip_store:
+            try:
+                cache.put(key, pickle.dumps(self.__dict__, pickle.HIGHEST_PROTOCOL))
+            except (pickle.PicklingError, TypeError, AttributeError, OSError) as error:
+                logger.debug(f"Not caching {cls.__name__}: {error}")
+
+    __init__._deck_original = init
+    return __init__
+
+
+def _log_stats():
+    if _cache is not None and _cache.hits + _cache.misses:
+        stats = _cache.stats()
+        logger.info(
+            f"Glyph cache: {stats['hits']} hits, {stats['misses']} misses "
+            f"({stats['hit_rate']:.0%}) in '{_cache.directory}'"
+        )
+
+
+def install():
+    """Route the constructors of :data:`CACHED_CLASSES` through the cache.
+
+    Defaults set with ``set_default`` before or after this call still apply.
+    Calling it more than once has no further effect.
+    """
+    if os.environ.get("DECK_GLYPH_CACHE", "1") == "0":
+        return
+
+    if all(hasattr(cls._original__init__, "_deck_original") for cls in CACHED_CLASSES):
+        return
+
+    for cls in CACHED_CLASSES:
+        original = cls._original__init__
+        if hasattr(original, "_deck_original"):
+            continue
+        cached = _cached_init(cls, original)
+        current = cls.__dict__.get("__init__")
+        cls._original__init__ = cached
+        if isinstance(current, partialmethod):  # set_default was already used
+            cls.__init__ = partialmethod(cached, *current.args, **current.keywords)
+        else:
+            cls.__init__ = cached
+
+    atexit.register(_log_stats)
@@ -0,0 +1,143 @@
+"""Export the last frame of every slide as PNG images and a PDF handout.
+
+Usage::
+
+    python -m deck.handout intuitive_limits.py TeachingDemo -j 8
+    python -m deck.handout intuitive_limits.py TeachingDemo handouts -qm --no-pdf
+
+writes ``handouts/TeachingDemo/001.png``, ``002.png``, ... and
+``handouts/TeachingDemo.pdf``, one page per slide.
+
+Nothing is animated or encoded: the sections of the
+:class:`~deck.sections.SectionedSlide` are fast-forwarded, every ``play``
+and ``wait`` being applied straight to its end state, and the frame is
+rasterized only where a slide ends, i.e. when ``next_slide()`` closes a
+slide and after the last section. Slides are numbered as
+``manim-slides present`` counts them.
+
+The slides are rasterized by ``--jobs`` worker processes. Each one walks the
+whole deck, which is cheap, and draws every ``jobs``-th slide, so that the
+workers share out the slides evenly however long the sections are.
+"""
+
+from __future__ import annotations
+
+import argparse
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from manim import logger
+from PIL import Image
+
+from .runner import add_scene_arguments, configure, load_scene, render_options
+
+# Width of the PDF pages; their height follows the aspect ratio of the frames.
+PAGE_WIDTH_INCHES = 10
+
+
+def capture_slides(file, scene_name, options, folder, worker=0, workers=1):
+    """Fast-forward a scene and save the last frame of its slides ``worker::workers``.
+
+    Returns the slide numbers and paths of the images written.
+    """
+    configure(options)
+    scene = load_scene(file, scene_name)()
+    scene.setup()
+    folder = Path(folder)
+    written = []
+
+    def capture():
+        number = len(scene._slides)
+        if (number - 1) % workers != worker:
+            return
+        path = folder / f"{number:03}.png"
+        scene.renderer.update_frame(scene)
+        scene.renderer.camera.get_image().save(path)
+        written.append((number, path))
+
+    next_slide = scene.next_slide
+
+    def next_slide_and_capture(*args, **kwargs):
+        count = len(scene._slides)
+        next_slide(*args, **kwargs)
+        if len(scene._slides) > count:
+            capture()
+
+    scene.next_slide = next_slide_and_capture
+    for name in scene.sections:
+        scene.fast_forward_section(name)
+
+    # The last slide, which Manim Slides adds when the scene ends.
+    count = len(scene._slides)
+    scene._add_last_slide()
+    if len(scene._slides) > count:
+        capture()
+    return written
+
+
+def write_pdf(images, path):
+    """Write ``images`` as the pages of the PDF file ``path``."""
+    pages = [Image.open(image).convert("RGB") for image in images]
+    pages[0].save(
+        path,
+        save_all=True,
+        append_images=pages[1:],
+        resolution=pages[0].width / PAGE_WIDTH_INCHES,
+    )
+
+
+def export_handout(file, scene_name, options, dest, jobs=None, pdf=True):
+    """Write the slides of ``scene_name`` to ``dest``; return the image paths."""
+    jobs = jobs or os.cpu_count()
+    folder = Path(dest) / scene_name
+    folder.mkdir(parents=True, exist_ok=True)
+    for stale in folder.glob("*.png"):
+        stale.unlink()
+
+    start = time.perf_counter()
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(jobs, mp_context=context) as pool:
+        futures = [
+            pool.submit(capture_slides, file, scene_name, options, folder, worker, jobs)
+            for worker in range(jobs)
+        ]
+        slides = sorted(slide for future in futures for slide in future.result())
+    images = [path for _, path in slides]
+    logger.info(f"Rasterized {len(images)} slides in {time.perf_counter() - start:.1f}s")
+
+    if pdf and images:
+        write_pdf(images, Path(dest) / f"{scene_name}.pdf")
+    return images
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m deck.handout", description=__doc__.splitlines()[0]
+    )
+    add_scene_arguments(parser)
+    parser.add_argument(
+        "dest", nargs="?", default="handouts", help="Output folder (default: handouts)."
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=os.cpu_count(),
+        help="Number of worker processes (default: number of CPUs).",
+    )
+    parser.add_argument("--no-pdf", action="store_true", help="Only write the PNG images.")
+    args = parser.parse_args(argv)
+
+    # A handout has every slide, at the requested quality.
+    os.environ.pop("DECK_DRAFT", None)
+    images = export_handout(
+        args.file, args.scene, render_options(args), args.dest, args.jobs, not args.no_pdf
+    )
+    print(f"Wrote {len(images)} slides to {Path(args.dest) / args.scene}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,188 @@
+"""Skip the rasterization and piping of frames that do not change.
+
+Lecture decks are mostly holds: ``self.wait()`` between reveals, the pause
+``next_slide()`` adds, plays whose updaters leave everything in place. manim
+still draws each of their frames with Cairo and pipes it to ffmpeg.
+
+A :class:`HoldSlide` changes two things in the Cairo renderer:
+
+- before drawing a frame of a play, it digests the moving mobjects (see
+  :func:`deck.incremental.mobjects_digest`); if nothing changed since the
+  previous frame of the same play, that frame is reused without redrawing;
+- a partial movie file only gets an ffmpeg pipe once a frame differs from
+  the first one. A play whose frames are all the same (a static ``wait``,
+  or a play that moves nothing) is encoded as a hold instead: its frame is
+  written once and ffmpeg repeats it for the play's duration.
+
+Hold files are encoded with the same codec and settings as manim's, at the
+same frame rate, so Manim Slides can still concatenate and reverse them
+without re-encoding. Plays streamed to an explicit file (coalesced runs,
+frame-split chunks) only benefit from the first change.
+
+``DECK_HOLDS=0`` disables both. They need the ffmpeg pipe of manim's file
+writer before 0.19 (``open_movie_pipe``); with the PyAV-based writer of
+later versions, plays are rendered as usual.
+"""
+
+from __future__ import annotations
+
+import os
+import subprocess
+import tempfile
+from pathlib import Path
+
+from manim import __version__, config, logger
+from manim.constants import RendererType
+from manim.utils.file_ops import is_png_format, is_webm_format, write_to_movie
+
+from .incremental import mobjects_digest
+from .sections import SectionedSlide
+
+
+def encode_hold(frame, num_frames, file_path):
+    """Encode ``frame`` repeated ``num_frames`` times as manim would."""
+    fps = config.frame_rate
+    if fps == int(fps):
+        fps = int(fps)
+    height, width = frame.shape[:2]
+    with tempfile.TemporaryDirectory() as directory:
+        raw = Path(directory) / "hold.rgba"
+        raw.write_bytes(frame.tobytes())
+        command = [
+            config.ffmpeg_executable,
+            "-y",
+            "-stream_loop",
+            "-1",
+            "-f",
+            "rawvideo",
+            "-s",
+            f"{width}x{height}",
+            "-pix_fmt",
+            "rgba",
+            "-r",
+            str(fps),
+            "-i",
+            str(raw),
+            "-frames:v",
+            str(num_frames),
+            "-an",
+            "-loglevel",
+            config.ffmpeg_loglevel.lower(),
+            "-metadata",
+            f"comment=Rendered with Manim Community v{__version__}",
+        ]
+        if is_webm_format():
+            command += ["-vcodec", "libvpx-vp9", "-auto-alt-ref", "0"]
+        elif config.transparent:
+            command += ["-vcodec", "qtrle"]
+        else:
+            command += ["-vcodec", "libx264", "-pix_fmt", "yuv420p"]
+        subprocess.run([*command, str(file_path)], check=True)
+
+
+class HoldEncoder:
+    """Reuses unchanged frames and encodes static plays as holds."""
+
+    def __init__(self, renderer):
+        self.renderer = renderer
+        self.frames_reused = 0
+        self.frames_held = 0
+        self._digest = None
+        self._frame = None
+        # Frame and count of a play whose ffmpeg pipe is not open yet.
+        self._pending = False
+        self._held = None
+        self._count = 0
+
+        file_writer = renderer.file_writer
+        self._open = file_writer.open_movie_pipe
+        self._write = file_writer.write_frame
+        self._close = file_writer.end_animation
+        self._begin = file_writer.begin_animation
+        self._save_static = renderer.save_static_frame_data
+        renderer.render = self.render
+        renderer.save_static_frame_data = self.save_static_frame_data
+        file_writer.begin_animation = self.begin_animation
+        file_writer.write_frame = self.write_frame
+        file_writer.end_animation = self.end_animation
+
+    def save_static_frame_data(self, scene, static_mobjects):
+        # A new static image: frames of the previous play cannot be reused.
+        self._digest = self._frame = None
+        return self._save_static(scene, static_mobjects)
+
+    def render(self, scene, time, moving_mobjects):
+        renderer = self.renderer
+        digest = mobjects_digest(moving_mobjects)
+        if digest == self._digest:
+            self.frames_reused += 1
+        else:
+            renderer.update_frame(scene, moving_mobjects)
+            self._digest, self._frame = digest, renderer.get_frame()
+        renderer.add_frame(self._frame)
+
+    def begin_animation(self, allow_write=False, file_path=None):
+        self._pending = False
+        if file_path is not None or not (allow_write and write_to_movie()):
+            return self._begin(allow_write, file_path=file_path)
+        self._pending, self._held, self._count = True, None, 0
+
+    def write_frame(self, frame):
+        if not self._pending:
+            return self._write(frame)
+        if self._held is None:
+            self._held, self._count = frame, 1
+        elif frame is self._held:
+            self._count += 1
+        else:
+            held, count = self._held, self._count
+            self._pending, self._held = False, None
+            self._open()
+            for _ in range(count):
+                self._write(held)
+            self._write(frame)
+
+    def end_animation(self, allow_write=False):
+        if not self._pending:
+            return self._close(allow_write)
+        self._pending = False
+        file_writer = self.renderer.file_writer
+        if not self._count:
+            self._open()
+            return self._close(allow_write)
+
+        held, self._held = self._held, None
+        file_writer.partial_movie_file_path = file_writer.partial_movie_files[
+            self.renderer.num_plays
+        ]
+        encode_hold(held, self._count, file_writer.partial_movie_file_path)
+        self.frames_held += self._count
+        logger.info(
+            f"Animation {self.renderer.num_plays} : Hold of {self._count} frames "
+            f"written in '{file_writer.partial_movie_file_path}'"
+        )
+
+
+class HoldSlide(SectionedSlide):
+    """A :class:`SectionedSlide` that does not redraw or re-encode static frames."""
+
+    holds: HoldEncoder | None = None
+
+    def setup(self):
+        super().setup()
+        if (
+            os.environ.get("DECK_HOLDS", "1") != "0"
+            and config.renderer == RendererType.CAIRO
+            and not is_png_format()
+            # manim >= 0.19 writes through PyAV, without an ffmpeg pipe to defer.
+            and hasattr(self.renderer.file_writer, "open_movie_pipe")
+        ):
+            self.holds = HoldEncoder(self.renderer)
+
+    def render(self, *args, **kwargs):
+        super().render(*args, **kwargs)
+        if self.holds is not None:
+            logger.info(
+                f"Holds: {self.holds.frames_reused} frames reused without redrawing, "
+                f"{self.holds.frames_held} encoded as holds"
+            )
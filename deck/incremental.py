@@ -0,0 +1,281 @@
+"""Section-level incremental rebuilds.
+
+Every section of a :class:`~deck.sections.SectionedSlide` gets a fingerprint
+made of:
+
+* the source of the section method, of the methods it calls on ``self`` and
+  of the module-level helpers it calls (e.g. ``paragraph``);
+* the fingerprints of the earlier sections that produce the ``self.*``
+  attributes it reads (e.g. ``self.objectives``, consumed by the next wipe);
+* the content of the asset files it names (e.g. ``"foundation.png"``);
+* the render config, the class' ``__init__`` and the manim versions;
+* the source files of the local modules the scene's module imports, directly
+  or through each other (such as :mod:`deck.tracked` or
+  :mod:`deck.plotting`), i.e. those outside the standard library and
+  ``site-packages``;
+* a digest of the scene's mobjects when the section starts.
+
+After a section is rendered, the hashes of its partial movie files are stored
+next to them in ``sections.json``. On the next render, a section whose
+fingerprint is unchanged is fast-forwarded (no rasterization, no encoding) and
+its previous partial movie files are reused, so only edited sections, and the
+sections depending on them, are rendered again.
+
+Set ``DECK_INCREMENTAL=0`` to disable it. It is also disabled by manim's
+``--disable_caching`` and ``--from_animation_number`` options.
+"""
+
+from __future__ import annotations
+
+import ast
+import hashlib
+import inspect
+import json
+import os
+import sys
+import sysconfig
+import textwrap
+from functools import lru_cache
+from pathlib import Path
+
+import manim
+import manim_slides
+import numpy as np
+from manim import config, logger
+
+from .sections import SectionedSlide
+
+CONFIG_KEYS = (
+    "pixel_width",
+    "pixel_height",
+    "frame_rate",
+    "frame_width",
+    "frame_height",
+    "background_color",
+    "background_opacity",
+    "renderer",
+    "movie_file_extension",
+    "transparent",
+)
+
+STATE_ARRAYS = ("points", "fill_rgbas", "stroke_rgbas", "background_stroke_rgbas", "pixel_array")
+
+
+def _sha256(*parts):
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(part if isinstance(part, bytes) else str(part).encode())
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def _parse(function):
+    return ast.parse(textwrap.dedent(inspect.getsource(function)))
+
+
+class SectionInfo:
+    """What a section's source says about it: code, attributes and assets."""
+
+    def __init__(self, cls, name):
+        self.name = name
+        self.sources: dict[str, str] = {}
+        self.reads: set[str] = set()
+        self.writes: set[str] = set()
+        self.assets: set[Path] = set()
+        self._visit(cls, getattr(cls, name))
+
+    def _visit(self, cls, function):
+        key = function.__qualname__
+        if key in self.sources:
+            return
+        self.sources[key] = inspect.getsource(function)
+        module = sys.modules.get(function.__module__)
+        directory = Path(getattr(module, "__file__", ".")).parent
+
+        for node in ast.walk(_parse(function)):
+            if (
+                isinstance(node, ast.Attribute)
+                and isinstance(node.value, ast.Name)
+                and node.value.id == "self"
+            ):
+                member = inspect.getattr_static(cls, node.attr, None)
+                if inspect.isfunction(member):
+                    if member.__module__ == cls.__module__:
+                        self._visit(cls, member)
+                elif isinstance(node.ctx, ast.Store):
+                    self.writes.add(node.attr)
+                else:
+                    self.reads.add(node.attr)
+            elif isinstance(node, ast.Call) and isinstance(node.func, ast.Name):
+                helper = getattr(module, node.func.id, None)
+                if inspect.isfunction(helper) and helper.__module__ == function.__module__:
+                    self._visit(cls, helper)
+            elif isinstance(node, ast.Constant) and isinstance(node.value, str):
+                for candidate in (Path(node.value), directory / node.value):
+                    if len(node.value) < 256 and candidate.suffix and candidate.is_file():
+                        self.assets.add(candidate.resolve())
+                        break
+
+
+def _is_installed(path):
+    """Whether ``path`` belongs to the standard library or an installed package."""
+    parts = Path(path).parts
+    if "site-packages" in parts or "dist-packages" in parts:
+        return True
+    stdlib = Path(sysconfig.get_paths()["stdlib"]).resolve()
+    return Path(path).resolve().is_relative_to(stdlib)
+
+
+def local_imports(module):
+    """Source files of the local modules ``module`` imports, transitively."""
+    seen, files, stack = {module.__name__}, set(), [module]
+    while stack:
+        for value in vars(stack.pop()).values():
+            name = value.__name__ if inspect.ismodule(value) else getattr(value, "__module__", None)
+            if not isinstance(name, str) or name in seen:
+                continue
+            seen.add(name)
+            imported = sys.modules.get(name)
+            path = getattr(imported, "__file__", None)
+            if path and path.endswith(".py") and not _is_installed(path):
+                files.add(Path(path))
+                stack.append(imported)
+    return sorted(files)
+
+
+@lru_cache(maxsize=None)
+def static_fingerprints(cls):
+    """Fingerprint every section of ``cls`` from its source and dependencies.
+
+    The scene state digest is not included: it is only known at render time.
+    """
+    environment = _sha256(
+        inspect.getsource(cls.__init__),
+        manim.__version__,
+        manim_slides.__version__,
+        *(f"{key}={config[key]}" for key in CONFIG_KEYS),
+        # Helpers such as deck.tracked are not walked like the scene's methods.
+        *(
+            path.name + _sha256(path.read_bytes())
+            for path in local_imports(sys.modules[cls.__module__])
+        ),
+    )
+    fingerprints: dict[str, str] = {}
+    producers: dict[str, str] = {}
+
+    for name in cls.sections:
+        info = SectionInfo(cls, name)
+        upstream = sorted(
+            {producers[attr] for attr in info.reads if attr in producers}
+        )
+        fingerprints[name] = _sha256(
+            environment,
+            *(f"{key}\n{source}" for key, source in sorted(info.sources.items())),
+            *(f"{producer}={fingerprints[producer]}" for producer in upstream),
+            *(path.name + _sha256(path.read_bytes()) for path in sorted(info.assets)),
+        )
+        for attr in info.writes:
+            producers[attr] = name
+
+    return fingerprints
+
+
+def scene_state_digest(scene):
+    """Digest the geometry and style of every mobject currently in ``scene``."""
+    return mobjects_digest(scene.get_mobject_family_members())
+
+
+def mobjects_digest(mobjects):
+    """Digest the geometry and style of ``mobjects`` (not their submobjects)."""
+    digest = hashlib.sha256()
+    for mobject in mobjects:
+        digest.update(type(mobject).__name__.encode())
+        for attr in STATE_ARRAYS:
+            value = getattr(mobject, attr, None)
+            if isinstance(value, np.ndarray):
+                digest.update(np.ascontiguousarray(value).tobytes())
+        digest.update(
+            repr(
+                (mobject.z_index, getattr(mobject, "stroke_width", None), len(mobject.updaters))
+            ).encode()
+        )
+    return digest.hexdigest()
+
+
+class IncrementalSlide(SectionedSlide):
+    """A :class:`SectionedSlide` that reuses unchanged sections between renders."""
+
+    # Whether the manifest is written after each section; turned off by
+    # processes that only render a part of the scene (see deck/parallel.py).
+    save_section_manifest = True
+
+    @property
+    def section_manifest_path(self):
+        return Path(self.renderer.file_writer.partial_movie_directory) / "sections.json"
+
+    def setup(self):
+        super().setup()
+        file_writer = self.renderer.file_writer
+        self.incremental = (
+            os.environ.get("DECK_INCREMENTAL", "1") != "0"
+            and config.write_to_movie
+            and not config.disable_caching
+            and not config.from_animation_number
+            and hasattr(file_writer, "partial_movie_directory")
+        )
+        self._section_manifest: dict[str, dict] = {}
+        if not self.incremental:
+            return
+
+        path = self.section_manifest_path
+        if path.exists():
+            try:
+                self._section_manifest = json.loads(path.read_text())
+            except ValueError:
+                logger.warning(f"Ignoring corrupted '{path}'")
+
+    def _save_section_manifest(self):
+        if self.save_section_manifest:
+            self.section_manifest_path.write_text(
+                json.dumps(self._section_manifest, indent=2)
+            )
+
+    def run_section(self, name):
+        if not self.incremental:
+            return super().run_section(name)
+
+        fingerprint = _sha256(static_fingerprints(type(self))[name], scene_state_digest(self))
+        entry = self._section_manifest.get(name)
+        file_writer = self.renderer.file_writer
+
+        if (
+            entry is not None
+            and entry["fingerprint"] == fingerprint
+            and all(file_writer.is_already_cached(h) for h in entry["partial_movie_files"])
+        ):
+            logger.info(
+                f"Section {name}: unchanged, reusing "
+                f"{len(entry['partial_movie_files'])} partial movie files"
+            )
+            if self.replay_section(name, entry["partial_movie_files"]):
+                return
+
+            del self._section_manifest[name]
+            self._save_section_manifest()
+            raise RuntimeError(
+                f"Section {name} played a different number of animations than "
+                "when it was rendered; its cache entry was dropped, please render again"
+            )
+
+        start = len(self.renderer.animations_hashes)
+        super().run_section(name)
+        partial_movie_files = self.renderer.animations_hashes[start:]
+
+        if all(partial_movie_files):
+            self._section_manifest[name] = {
+                "fingerprint": fingerprint,
+                "partial_movie_files": partial_movie_files,
+            }
+        else:
+            self._section_manifest.pop(name, None)
+        self._save_section_manifest()
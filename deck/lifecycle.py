@@ -0,0 +1,115 @@
+"""Release the mobjects that ``wipe`` takes off screen.
+
+Decks keep every section's groups on ``self`` so that a later ``wipe`` can
+take them away, and nothing ever drops them: their points, images and
+updaters (``always_redraw`` or :mod:`deck.tracked` closures over axes and
+graphs) stay in memory for the rest of the render.
+
+A :class:`LifecycleSlide` retires the mobjects wiped out by ``self.wipe``:
+their updaters are detached right after the wipe, and when the section
+ends, the point arrays and pixel buffers of those that did not come back on
+screen are replaced by empty ones. The Python objects remain, so ``self``
+attributes can still be wiped or inspected, but they no longer hold any
+geometry; copies made in the same section (``texts.copy()`` after a wipe)
+are unaffected.
+
+At the end of each section, the ``self`` attributes holding off-screen
+mobjects that still have updaters are logged as warnings (once each).
+
+``DECK_LIFECYCLE=report`` only logs, ``DECK_LIFECYCLE=0`` disables both.
+"""
+
+from __future__ import annotations
+
+import os
+
+import numpy as np
+from manim import ImageMobject, Mobject, logger
+
+from .sections import SectionedSlide
+
+_EMPTY_POINTS = np.zeros((0, 3))
+
+
+def release(mobject):
+    """Drop the geometry of ``mobject``; return the number of bytes freed."""
+    freed = mobject.points.nbytes
+    mobject.points = _EMPTY_POINTS.copy()
+    if isinstance(mobject, ImageMobject):
+        freed += mobject.pixel_array.nbytes
+        mobject.pixel_array = np.zeros((1, 1, 4), dtype=mobject.pixel_array_dtype)
+    for name in ("target", "saved_state"):
+        if getattr(mobject, name, None) is not None:
+            setattr(mobject, name, None)
+    return freed
+
+
+def _attribute_mobjects(value):
+    """The mobjects held by an attribute, directly or in a list, tuple or dict."""
+    if isinstance(value, Mobject):
+        return [value]
+    if isinstance(value, dict):
+        value = list(value.values())
+    if isinstance(value, (list, tuple)):
+        return [item for item in value if isinstance(item, Mobject)]
+    return []
+
+
+class LifecycleSlide(SectionedSlide):
+    """A :class:`SectionedSlide` that frees what ``wipe`` removes from the scene."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.lifecycle = os.environ.get("DECK_LIFECYCLE", "release")
+        self._retired: list[Mobject] = []
+        self._scene_attributes: set[str] = set()
+        self._reported: set[str] = set()
+
+    def setup(self):
+        super().setup()
+        # Attributes set up to here belong to the scene machinery, not the deck.
+        self._scene_attributes = set(vars(self))
+
+    def wipe(self, *args, return_animation=False, **kwargs):
+        animation = super().wipe(*args, return_animation=return_animation, **kwargs)
+        current = args[0] if args else kwargs.get("current")
+        if current is not None and not return_animation and self.lifecycle == "release":
+            self._retire(*_attribute_mobjects(current) or current)
+        return animation
+
+    def _retire(self, *mobjects):
+        on_screen = set(self.get_mobject_family_members())
+        for mobject in mobjects:
+            for member in mobject.get_family():
+                if member not in on_screen:
+                    member.clear_updaters(recursive=False)
+                    self._retired.append(member)
+
+    def run_section(self, name):
+        super().run_section(name)
+        if self.lifecycle == "0":
+            return
+
+        on_screen = set(self.get_mobject_family_members())
+        if self._retired:
+            retired, self._retired = self._retired, []
+            freed = sum(release(mobject) for mobject in set(retired) - on_screen)
+            logger.info(f"Section {name}: released {freed / 2**20:.1f} MiB of wiped mobjects")
+
+        for attribute, value in vars(self).items():
+            if attribute in self._scene_attributes or attribute in self._reported:
+                continue
+            for mobject in _attribute_mobjects(value):
+                updated = [
+                    member
+                    for member in mobject.get_family()
+                    if member.updaters and member not in on_screen
+                ]
+                if updated:
+                    self._reported.add(attribute)
+                    classes = sorted({type(member).__name__ for member in updated})
+                    logger.warning(
+                        f"Section {name}: self.{attribute} is off screen but "
+                        f"{len(updated)} of its mobjects still have updaters "
+                        f"({', '.join(classes)})"
+                    )
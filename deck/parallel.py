@@ -0,0 +1,111 @@
+"""Render the sections of a scene in parallel, then merge them into one deck.
+
+Usage::
+
+    python -m deck.parallel intuitive_limits.py TeachingDemo -j 8 -qh
+    manim-slides convert TeachingDemo _site/index.html
+
+Each section of an :class:`~deck.incremental.IncrementalSlide` is rendered
+by its own worker process. A worker rebuilds the state its section starts
+from (the previous section's final groups that the next ``wipe`` consumes,
+the attributes set on ``self``, ...) by fast-forwarding the earlier sections,
+which computes their end states without rasterizing or encoding anything,
+and then renders its section into manim's partial movie files.
+
+The workers report their section manifest entries (see
+:mod:`deck.incremental`) to the parent, which writes them and then runs one
+ordinary in-process render: every section is reused from the workers' files,
+so this last pass only fast-forwards, concatenates the slide videos and
+writes the ``slides/<Scene>.json`` file used by ``manim-slides convert``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from manim import logger
+
+from .runner import add_scene_arguments, configure, load_scene, render_options
+
+
+def render_section(file, scene_name, options, section):
+    """Render one section of a scene; return its manifest entry, or ``None``."""
+    configure(options)
+    scene = load_scene(file, scene_name)()
+    scene.save_section_manifest = False
+    scene.setup()
+    if not scene.incremental:
+        raise RuntimeError(
+            "Parallel rendering needs incremental rendering to merge sections; "
+            "do not disable it (DECK_INCREMENTAL, --disable_caching)"
+        )
+
+    for name in scene.sections:
+        if name == section:
+            scene.run_section(name)
+            return scene._section_manifest.get(name)
+        scene.fast_forward_section(name)
+
+    raise ValueError(f"{scene_name} has no section named {section!r}")
+
+
+def merge_sections(scene, entries):
+    """Record the workers' manifest ``entries`` so that ``scene`` reuses their files."""
+    path = scene.section_manifest_path
+    manifest = json.loads(path.read_text()) if path.exists() else {}
+    manifest.update({section: entry for section, entry in entries.items() if entry})
+    path.write_text(json.dumps(manifest, indent=2))
+
+    missing = [section for section, entry in entries.items() if not entry]
+    if missing:
+        logger.warning(f"Sections {missing} could not be reused and will be rendered now")
+
+
+def render_parallel(file, scene_name, options, jobs=None):
+    """Render all sections of ``scene_name`` with ``jobs`` workers and merge them."""
+    configure(options)
+    scene_cls = load_scene(file, scene_name)
+    entries = {}
+
+    start = time.perf_counter()
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(jobs, mp_context=context) as pool:
+        futures = {
+            pool.submit(render_section, file, scene_name, options, section): section
+            for section in scene_cls.sections
+        }
+        for future in as_completed(futures):
+            section = futures[future]
+            entries[section] = future.result()
+            logger.info(f"Section {section} done after {time.perf_counter() - start:.1f}s")
+
+    scene = scene_cls()
+    merge_sections(scene, entries)
+
+    scene.render()
+    logger.info(f"Rendered {scene_name} in {time.perf_counter() - start:.1f}s")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m deck.parallel", description=__doc__.splitlines()[0]
+    )
+    add_scene_arguments(parser)
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=os.cpu_count(),
+        help="Number of worker processes (default: number of CPUs).",
+    )
+    args = parser.parse_args(argv)
+    render_parallel(args.file, args.scene, render_options(args), args.jobs)
+
+
+if __name__ == "__main__":
+    main()
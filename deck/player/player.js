@@ -0,0 +1,102 @@
+// Plays a deck exported by ``python -m deck.web``.
+//
+// Only the current and the next slides have a <video> element, so the
+// browser only downloads those two segments; the others are loaded when
+// the viewer gets close to them. Keys: right arrow, space, page down or a
+// click for the next slide; left arrow or page up for the previous one;
+// home and end; "f" for full screen.
+
+const stage = document.getElementById("stage");
+const counter = document.getElementById("counter");
+const videos = new Map();
+let slides = [];
+let index = 0;
+
+function slideFromHash() {
+  const number = parseInt(location.hash.slice(1), 10);
+  return Number.isNaN(number) ? 0 : Math.min(Math.max(number - 1, 0), slides.length - 1);
+}
+
+function videoFor(i) {
+  let video = videos.get(i);
+  if (!video) {
+    const slide = slides[i];
+    video = document.createElement("video");
+    video.muted = true;
+    video.playsInline = true;
+    video.preload = "auto";
+    video.loop = slide.loop;
+    if (slide.poster) video.poster = slide.poster;
+    video.src = slide.file;
+    video.addEventListener("ended", () => {
+      if (slide.auto_next && video.classList.contains("current")) show(i + 1);
+    });
+    stage.appendChild(video);
+    videos.set(i, video);
+  }
+  return video;
+}
+
+function show(i, atEnd = false) {
+  if (i < 0 || i >= slides.length) return;
+  index = i;
+  const slide = slides[i];
+  const video = videoFor(i);
+  // Keep the current and next slides, release the others.
+  for (const [j, other] of videos) {
+    if (j !== i && j !== i + 1) {
+      other.removeAttribute("src");
+      other.load();
+      other.remove();
+      videos.delete(j);
+    }
+  }
+  if (i + 1 < slides.length) videoFor(i + 1);
+
+  for (const element of stage.children) element.classList.toggle("current", element === video);
+  document.body.style.background = slide.background_color;
+  counter.textContent = `${i + 1} / ${slides.length}`;
+  history.replaceState(null, "", `#${i + 1}`);
+
+  if (atEnd) {
+    // Going back shows the previous slide as it ended.
+    video.pause();
+    const seek = () => { video.currentTime = video.duration; };
+    if (video.readyState >= 1) seek();
+    else video.addEventListener("loadedmetadata", seek, { once: true });
+  } else {
+    video.currentTime = 0;
+    video.playbackRate = slide.playback_rate;
+    video.play().catch(() => {});
+  }
+}
+
+document.addEventListener("keydown", (event) => {
+  switch (event.key) {
+    case "ArrowRight": case " ": case "PageDown": show(index + 1); break;
+    case "ArrowLeft": case "PageUp": show(index - 1, true); break;
+    case "Home": show(0); break;
+    case "End": show(slides.length - 1); break;
+    case "f": document.fullscreenElement
+      ? document.exitFullscreen() : document.documentElement.requestFullscreen();
+      break;
+    default: return;
+  }
+  event.preventDefault();
+});
+stage.addEventListener("click", () => show(index + 1));
+window.addEventListener("hashchange", () => {
+  if (slideFromHash() !== index) show(slideFromHash());
+});
+
+if ("serviceWorker" in navigator && location.protocol.startsWith("http")) {
+  navigator.serviceWorker.register("sw.js");
+}
+
+fetch("manifest.json")
+  .then((response) => response.json())
+  .then((manifest) => {
+    slides = manifest.slides;
+    document.title = manifest.title;
+    show(slideFromHash());
+  });
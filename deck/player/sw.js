@@ -0,0 +1,86 @@
+// Service worker of a deck exported by ``python -m deck.web``.
+//
+// Segments and posters are named after their content, so once fetched they
+// are served from the cache, range requests included. The page and the
+// manifest are fetched from the network first, and the cache only keeps
+// the segments and posters listed in the latest manifest.
+
+const MEDIA = "deck-media";
+const PAGES = "deck-pages";
+
+self.addEventListener("install", () => self.skipWaiting());
+self.addEventListener("activate", (event) => event.waitUntil(self.clients.claim()));
+
+function isMedia(url) {
+  return /\/(segments|posters)\/[^/]+$/.test(url.pathname);
+}
+
+async function fromCache(cached, range) {
+  if (!range) return cached;
+  const blob = await cached.blob();
+  const [, first, last] = /bytes=(\d*)-(\d*)/.exec(range) || [];
+  let start = first ? Number(first) : blob.size - Number(last);
+  let end = first && last ? Number(last) : blob.size - 1;
+  start = Math.max(start, 0);
+  end = Math.min(end, blob.size - 1);
+  return new Response(blob.slice(start, end + 1), {
+    status: 206,
+    headers: {
+      "Content-Type": cached.headers.get("Content-Type") || "video/mp4",
+      "Content-Range": `bytes ${start}-${end}/${blob.size}`,
+      "Content-Length": String(end - start + 1),
+    },
+  });
+}
+
+async function media(event) {
+  const cache = await caches.open(MEDIA);
+  const url = event.request.url;
+  const range = event.request.headers.get("Range");
+  const cached = await cache.match(url);
+  if (cached) return fromCache(cached, range);
+  // A request for the whole file (or from its start) is also stored;
+  // seeks into a segment not cached yet go to the network as they are.
+  if (!range || /^bytes=0-$/.test(range)) {
+    const response = await fetch(url);
+    if (response.ok) event.waitUntil(cache.put(url, response.clone()));
+    return response;
+  }
+  return fetch(event.request);
+}
+
+async function prune(manifest) {
+  const cache = await caches.open(MEDIA);
+  const listed = new Set();
+  for (const slide of manifest.slides) {
+    listed.add(new URL(slide.file, self.registration.scope).href);
+    if (slide.poster) listed.add(new URL(slide.poster, self.registration.scope).href);
+  }
+  for (const request of await cache.keys()) {
+    if (!listed.has(request.url)) await cache.delete(request);
+  }
+}
+
+async function page(event) {
+  const cache = await caches.open(PAGES);
+  try {
+    const response = await fetch(event.request);
+    if (response.ok) {
+      event.waitUntil(cache.put(event.request, response.clone()));
+      if (event.request.url.endsWith("/manifest.json")) {
+        event.waitUntil(response.clone().json().then(prune));
+      }
+    }
+    return response;
+  } catch (error) {
+    const cached = await cache.match(event.request);
+    if (cached) return cached;
+    throw error;
+  }
+}
+
+self.addEventListener("fetch", (event) => {
+  const url = new URL(event.request.url);
+  if (event.request.method !== "GET" || url.origin !== location.origin) return;
+  event.respondWith(isMedia(url) ? media(event) : page(event));
+});
@@ -0,0 +1,226 @@
+"""Adaptive plots of functions with holes, jumps and gaps in their domain.
+
+``Axes.plot`` samples a function at a fixed step and joins every sample, so
+graphs with a removable discontinuity are drawn by hand: one plot up to just
+before the hole, one from just after it, at whatever steps look right, and a
+``Circle`` at the hole. :class:`FunctionPlot` does this from the function
+alone::
+
+    graph = FunctionPlot(ax, lambda x: (x**3 - 1) / (x - 1), x_range=[-2, 2, 1])
+    self.play(Create(graph))
+    self.play(Indicate(graph.holes[0]))
+
+The function is evaluated on whole NumPy arrays (see
+:func:`deck.riemann._evaluate`). Starting from a coarse grid, every interval
+whose midpoint lies more than ``tolerance`` scene units away from the chord
+is bisected, one vectorized batch per level, so straight and gently curved
+parts keep few points while steep parts are refined.
+
+Isolated points are examined at the grid samples, which include every
+multiple of the step ``x_range[2]``: where the one-sided limits agree but the
+function is undefined or takes another value, the curve is split there, an
+open circle is drawn at the limit and a filled one at the value, if any.
+Jumps draw open circles at the one-sided limits (the value, if defined, is
+filled). Between samples, non-finite values and jumps that survive the
+finest refinement split the curve without markers.
+"""
+
+from __future__ import annotations
+
+import numpy as np
+from manim import BLUE, Circle, VGroup, VMobject
+
+from .riemann import _evaluate
+
+
+def _trim_end(points, center, radius):
+    """Cut the end of a polyline where it enters the circle ``(center, radius)``."""
+    distances = np.linalg.norm(points - center, axis=1)
+    kept = len(points)
+    while kept and distances[kept - 1] < radius:
+        kept -= 1
+    if kept in (0, len(points)):
+        return points[:kept]
+    outside, inside = distances[kept - 1], distances[kept]
+    t = (outside - radius) / (outside - inside)
+    boundary = points[kept - 1] + t * (points[kept] - points[kept - 1])
+    return np.vstack([points[:kept], boundary])
+
+
+class FunctionPlot(VGroup):
+    """The graph of ``function`` over ``x_range``, split at its discontinuities.
+
+    The curves, the open circles and the filled circles are also available
+    as :attr:`curves`, :attr:`holes` and :attr:`dots`. All submobjects are
+    ordered from left to right, so ``Create`` draws the graph in that order.
+
+    Like the graphs of ``Axes.plot``, it has an ``underlying_function`` and a
+    parametric :meth:`function`, so ``ax.input_to_graph_point`` and the
+    tracked mobjects of :mod:`deck.tracked` accept it as a graph.
+    """
+
+    def __init__(
+        self,
+        ax,
+        function,
+        x_range,
+        color=BLUE,
+        hole_radius=0.08,
+        dot_radius=None,
+        tolerance=0.01,
+        initial_samples=33,
+        max_depth=10,
+        **kwargs,
+    ):
+        super().__init__()
+        self.ax = ax
+        self.underlying_function = function
+        self.tolerance = tolerance
+        self.hole_radius = hole_radius
+        self.dot_radius = hole_radius / 2 if dot_radius is None else dot_radius
+
+        x_min, x_max = x_range[:2]
+        xs = np.linspace(x_min, x_max, initial_samples)
+        if len(x_range) > 2:
+            step = x_range[2]
+            multiples = np.arange(np.ceil(x_min / step), np.floor(x_max / step) + 1) * step
+            xs = np.union1d(xs, multiples)
+
+        # One-sided limits are approximated a small step away from each sample,
+        # unless the value still moves when the step doubles (a pole).
+        eps = (x_max - x_min) * 1e-7
+        with np.errstate(all="ignore"):
+            values = self._evaluate(xs)
+            lefts, rights = self._evaluate(xs - eps), self._evaluate(xs + eps)
+            lefts[~self._close(xs, lefts, xs, self._evaluate(xs - 2 * eps))] = np.nan
+            rights[~self._close(xs, rights, xs, self._evaluate(xs + 2 * eps))] = np.nan
+        lefts[0], rights[-1] = np.nan, np.nan
+
+        holes, dots = [], []
+        # Samples with a left and a right value; ``linked[i]`` tells whether
+        # the curve goes on from sample i to sample i + 1.
+        sample_xs, sample_ys, linked = [], [], []
+        for x, value, left, right in zip(xs, values, lefts, rights):
+            ends = (left, right)
+            if np.isfinite(ends).all() and self._close(x, left, x, right):
+                ends = ((left + right) / 2,) * 2
+            limits = [y for y in dict.fromkeys(ends) if np.isfinite(y)]
+            if not limits or (
+                np.isfinite(value) and all(self._close(x, value, x, y) for y in limits)
+            ):
+                sample_xs.append(x), sample_ys.append(value), linked.append(True)
+                continue
+
+            if np.isfinite(value):
+                dots.append((x, value))
+            holes += [
+                (x, y)
+                for y in limits
+                if not (np.isfinite(value) and self._close(x, value, x, y))
+            ]
+            sample_xs += [x, x]
+            sample_ys += list(ends)
+            linked += [False, True]
+        self.hole_points = holes
+        self.dot_points = dots
+
+        xs, ys, breaks = self._refine(
+            np.array(sample_xs), np.array(sample_ys), np.array(linked[:-1]), max_depth
+        )
+
+        # (x, rank, mobject): left to right, markers before a curve at the same x
+        ordered = []
+        self.holes = VGroup()
+        for x, y in self.hole_points:
+            hole = Circle(radius=hole_radius, color=color).move_to(ax.coords_to_point(x, y))
+            self.holes.add(hole)
+            ordered.append((x, 0, hole))
+        self.dots = VGroup()
+        for x, y in self.dot_points:
+            dot = Circle(radius=self.dot_radius, color=color, fill_opacity=1)
+            self.dots.add(dot.move_to(ax.coords_to_point(x, y)))
+            ordered.append((x, 0, dot))
+
+        self.curves = VGroup()
+        centers = [hole.get_center() for hole in self.holes]
+        starts = np.flatnonzero(np.concatenate([[True], breaks]))
+        for start, stop in zip(starts, np.append(starts[1:], len(xs))):
+            finite = np.isfinite(ys[start:stop])
+            # Non-finite samples end a curve as well.
+            pieces = np.split(np.arange(start, stop), np.flatnonzero(np.diff(finite)) + 1)
+            for piece in pieces:
+                if not finite[piece[0] - start]:
+                    continue
+                points = self._screen(xs[piece], ys[piece])
+                for center in centers:
+                    if len(points) and np.allclose(points[-1], center):
+                        points = _trim_end(points, center, hole_radius)
+                    if len(points) and np.allclose(points[0], center):
+                        points = _trim_end(points[::-1], center, hole_radius)[::-1]
+                if len(points) < 2:
+                    continue
+                curve = VMobject(color=color, **kwargs)
+                curve.set_points_as_corners(points).make_smooth()
+                self.curves.add(curve)
+                ordered.append((xs[piece[0]], 1, curve))
+
+        ordered.sort(key=lambda item: item[:2])
+        self.add(*(mobject for *_, mobject in ordered))
+
+    def function(self, x):
+        """The point of the graph above ``x``, as ``ParametricFunction.function``."""
+        return self.ax.coords_to_point(x, self.underlying_function(x))
+
+    def _evaluate(self, xs):
+        return _evaluate(self.underlying_function, xs)
+
+    def _screen(self, xs, ys):
+        return np.asarray(self.ax.coords_to_point(xs, ys)).T
+
+    def _close(self, x0, y0, x1, y1):
+        """Whether the points are within tolerance on screen (NaN never is)."""
+        distance = np.linalg.norm(self._screen(x1, y1) - self._screen(x0, y0), axis=-1)
+        return distance <= self.tolerance
+
+    def _refine(self, xs, ys, linked, max_depth):
+        """Bisect intervals until every chord is within tolerance.
+
+        Returns the samples and, for each interval between two of them,
+        whether the curve is broken there.
+        """
+        unresolved = np.zeros(len(linked), dtype=bool)
+        for depth in range(max_depth + 1):
+            finite = np.isfinite(ys)
+            both = finite[:-1] & finite[1:]
+            edge = finite[:-1] ^ finite[1:]
+            candidates = np.flatnonzero(linked & (both | edge))
+            if not len(candidates):
+                break
+
+            mid_xs = (xs[candidates] + xs[candidates + 1]) / 2
+            with np.errstate(all="ignore"):
+                mid_ys = self._evaluate(mid_xs)
+
+            refine = edge[candidates]
+            smooth = both[candidates]
+            if smooth.any():
+                i = candidates[smooth]
+                chords = (self._screen(xs[i], ys[i]) + self._screen(xs[i + 1], ys[i + 1])) / 2
+                errors = np.linalg.norm(
+                    self._screen(mid_xs[smooth], mid_ys[smooth]) - chords, axis=1
+                )
+                refine[smooth] = ~(errors <= self.tolerance)  # NaN midpoints refine too
+
+            if depth == max_depth:
+                unresolved[candidates[refine & smooth]] = True
+                break
+            if not refine.any():
+                break
+
+            where = candidates[refine] + 1
+            xs = np.insert(xs, where, mid_xs[refine])
+            ys = np.insert(ys, where, mid_ys[refine])
+            linked = np.insert(linked, where, True)
+            unresolved = np.insert(unresolved, where, False)
+
+        return xs, ys, ~linked | unresolved
@@ -0,0 +1,260 @@
+"""Per-call render profiles of slide scenes.
+
+With ``DECK_PROFILE=1`` (or set to an output directory), a
+:class:`ProfiledSlide` records every ``play``, ``wait``, ``wipe``,
+``next_slide`` and section call with:
+
+- its wall time, split into animation updates (interpolation and updaters),
+  Cairo rasterization and ffmpeg encoding (frame writes, process start and
+  flush);
+- the frames rasterized (drawn by the camera) and written;
+- the mobjects in the scene, their family size and how many carry updaters;
+- the peak resident set size of the process so far;
+- the section (``construct_*`` method) and slide index it belongs to.
+
+After the render, two files are written to ``<media_dir>/profiles`` (or the
+given directory): ``<Scene>.json``, with the calls and their totals per
+section and per slide, and ``<Scene>.trace.json`` in the Chrome trace event
+format, to open in ``chrome://tracing``, Perfetto or speedscope.
+"""
+
+from __future__ import annotations
+
+import functools
+import json
+import os
+import sys
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+from manim import config, logger
+
+from .sections import SectionedSlide
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+PHASES = ("update", "rasterize", "encode")
+
+
+def peak_rss_mb():
+    """Peak resident set size of this process, in MiB (``None`` if unknown)."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # kilobytes on Linux, bytes on macOS
+    return peak / 2**20 if sys.platform == "darwin" else peak / 2**10
+
+
+def _label(animation):
+    name = type(animation).__name__
+    return "animate" if name == "_AnimationBuilder" else name
+
+
+class Profiler:
+    """Collects the profile of one scene."""
+
+    def __init__(self, scene):
+        self.scene = scene
+        self.events: list[dict] = []
+        self.phases = dict.fromkeys(PHASES, 0.0)
+        self.frames_rasterized = 0
+        self.frames_written = 0
+        self._depth = 0
+        self._origin = time.perf_counter()
+
+        renderer = scene.renderer
+        file_writer = renderer.file_writer
+        camera = renderer.camera
+        renderer.update_frame = self._timed(renderer.update_frame, "rasterize")
+        # update_frame returns early while animations are skipped, and a frozen frame is drawn
+        # once and then written again: only the camera's captures are frames rasterized.
+        camera.capture_mobjects = self._counted(camera.capture_mobjects, "frames_rasterized")
+        file_writer.write_frame = self._timed(file_writer.write_frame, "encode", "frames_written")
+        file_writer.begin_animation = self._timed(file_writer.begin_animation, "encode")
+        file_writer.end_animation = self._timed(file_writer.end_animation, "encode")
+
+    def _counted(self, function, counter):
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            setattr(self, counter, getattr(self, counter) + 1)
+            return function(*args, **kwargs)
+
+        return wrapper
+
+    def _timed(self, function, phase, counter=None):
+        if counter is not None:
+            function = self._counted(function, counter)
+
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            with self.phase(phase):
+                return function(*args, **kwargs)
+
+        return wrapper
+
+    @contextmanager
+    def phase(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases[name] += time.perf_counter() - start
+
+    @contextmanager
+    def record(self, kind, name=None):
+        """Record the call running in this block as one event."""
+        scene = self.scene
+        phases = dict(self.phases)
+        frames = self.frames_rasterized, self.frames_written
+        section, slide = scene.current_section, scene._current_slide
+        # Sections are not counted as a nesting level of the calls they contain.
+        depth, nested = self._depth, kind != "section"
+        start = time.perf_counter()
+        self._depth += nested
+        try:
+            yield
+        finally:
+            self._depth -= nested
+            family = scene.get_mobject_family_members()
+            self.events.append(
+                {
+                    "kind": kind,
+                    "name": name or kind,
+                    "section": section,
+                    "slide": slide,
+                    "depth": depth,
+                    "start": start - self._origin,
+                    "wall": time.perf_counter() - start,
+                    **{
+                        phase: self.phases[phase] - phases[phase] for phase in PHASES
+                    },
+                    "frames_rasterized": self.frames_rasterized - frames[0],
+                    "frames_written": self.frames_written - frames[1],
+                    "mobjects": len(scene.mobjects),
+                    "family_size": len(family),
+                    "updaters": sum(1 for mobject in family if mobject.updaters),
+                    "peak_rss_mb": peak_rss_mb(),
+                }
+            )
+
+    def totals(self, key):
+        """Sum the top-level calls by ``key`` (``"section"`` or ``"slide"``)."""
+        totals: dict[str, dict] = {}
+        for event in self.events:
+            if event["depth"] or event["kind"] == "section":
+                continue
+            total = totals.setdefault(
+                str(event[key]),
+                dict.fromkeys(("wall", *PHASES, "frames_rasterized", "frames_written"), 0),
+            )
+            for field in total:
+                total[field] += event[field]
+        return totals
+
+    def chrome_trace(self):
+        pid = os.getpid()
+        trace = []
+        for event in self.events:
+            trace.append(
+                {
+                    "name": event["name"],
+                    "cat": event["kind"],
+                    "ph": "X",
+                    "ts": event["start"] * 1e6,
+                    "dur": event["wall"] * 1e6,
+                    "pid": pid,
+                    "tid": 0,
+                    "args": {
+                        key: value
+                        for key, value in event.items()
+                        if key not in ("name", "kind", "start", "wall")
+                    },
+                }
+            )
+            if event["peak_rss_mb"] is not None:
+                trace.append(
+                    {
+                        "name": "peak RSS (MiB)",
+                        "ph": "C",
+                        "ts": (event["start"] + event["wall"]) * 1e6,
+                        "pid": pid,
+                        "args": {"rss": event["peak_rss_mb"]},
+                    }
+                )
+        return {"traceEvents": trace, "displayTimeUnit": "ms"}
+
+    def write(self, directory):
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        name = type(self.scene).__name__
+        profile = {
+            "scene": name,
+            "quality": f"{config.pixel_height}p{config.frame_rate:g}",
+            "wall": time.perf_counter() - self._origin,
+            "peak_rss_mb": peak_rss_mb(),
+            "sections": self.totals("section"),
+            "slides": self.totals("slide"),
+            "events": self.events,
+        }
+        path = directory / f"{name}.json"
+        path.write_text(json.dumps(profile, indent=2))
+        (directory / f"{name}.trace.json").write_text(json.dumps(self.chrome_trace()))
+        logger.info(f"Render profile written to '{path}'")
+        return path
+
+
+class ProfiledSlide(SectionedSlide):
+    """A :class:`SectionedSlide` that records a :class:`Profiler` when asked to."""
+
+    profiler: Profiler | None = None
+
+    def setup(self):
+        super().setup()
+        if os.environ.get("DECK_PROFILE", "0") != "0":
+            self.profiler = Profiler(self)
+
+    @contextmanager
+    def _profiled(self, kind, name=None):
+        if self.profiler is None:
+            yield
+        else:
+            with self.profiler.record(kind, name):
+                yield
+
+    def render(self, *args, **kwargs):
+        super().render(*args, **kwargs)
+        if self.profiler is not None:
+            setting = os.environ["DECK_PROFILE"]
+            self.profiler.write(
+                Path(config.media_dir) / "profiles" if setting == "1" else setting
+            )
+
+    def run_section(self, name):
+        with self._profiled("section", name):
+            super().run_section(name)
+
+    def play(self, *args, **kwargs):
+        with self._profiled("play", ", ".join(map(_label, args)) or None):
+            super().play(*args, **kwargs)
+
+    def wait(self, *args, **kwargs):
+        with self._profiled("wait"):
+            super().wait(*args, **kwargs)
+
+    def wipe(self, *args, **kwargs):
+        with self._profiled("wipe"):
+            return super().wipe(*args, **kwargs)
+
+    def next_slide(self, *args, **kwargs):
+        with self._profiled("next_slide"):
+            super().next_slide(*args, **kwargs)
+
+    def update_to_time(self, t):
+        if self.profiler is None:
+            return super().update_to_time(t)
+        with self.profiler.phase("update"):
+            return super().update_to_time(t)
@@ -0,0 +1,176 @@
+"""Numbers that lay out their glyphs once and then only move them.
+
+:meth:`DecimalNumber.set_value` builds the number again: it copies a
+``MathTex`` for every character, scales each copy to the font size, arranges
+them, matches their style to the old ones and zeroes the points of the old
+family. With ``tracked_number`` (or ``always_redraw``) that happens on every
+frame of a sweep, and a :class:`~manim.mobject.table.DecimalTable` does it
+once per cell.
+
+A :class:`GlyphReadout` is a :class:`DecimalNumber` drawn from a glyph atlas
+instead: the outlines of the digits 0-9, the signs, the decimal point and the
+unit are laid out by LaTeX once per process, and shared by every readout.
+The readout owns one plain ``VMobject`` per character; setting its value
+writes the outlines of the new characters, shifted to their place, into
+those slots. The family of the readout (and the style of each slot) is the
+same before and after, so nothing is copied, restyled or zeroed, and a value
+whose text did not change costs nothing but the move::
+
+    readout = GlyphReadout(0.1, num_decimal_places=2, color=BLACK)
+    readout.add_updater(lambda m: m.set_value(t.get_value()).move_to(point()))
+
+    table = DecimalTable(values, element_to_mobject=GlyphReadout, ...)
+
+The layout is the one of :class:`DecimalNumber` (same characters, buffers
+and alignment of signs, commas and units). Slots are added when a longer
+number comes up, and the points of unused ones are cleared.
+``include_background_rectangle`` is not supported.
+
+Like the characters of a :class:`DecimalNumber`, the glyphs are built with
+the ``font_size`` and ``tex_template`` set with ``set_default`` (and the TeX
+template of ``config``), and the atlas keeps one outline per combination.
+"""
+
+from __future__ import annotations
+
+from functools import partialmethod
+
+import numpy as np
+from manim import (
+    DEFAULT_FONT_SIZE,
+    DecimalNumber,
+    SingleStringMathTex,
+    VMobject,
+    config,
+)
+
+# Outlines of each (class, string, font size, TeX template), at DEFAULT_FONT_SIZE.
+_atlas: dict[tuple, np.ndarray] = {}
+
+
+def clear():
+    """Forget every glyph outline."""
+    _atlas.clear()
+
+
+def _defaults(mob_class):
+    """The keyword arguments set with ``set_default`` on ``mob_class`` (or a parent)."""
+    init = next(cls.__dict__["__init__"] for cls in mob_class.__mro__ if "__init__" in cls.__dict__)
+    layers = []
+    # Each set_default call wraps the constructor in one more partialmethod.
+    while isinstance(init, partialmethod):
+        layers.append(init.keywords)
+        init = getattr(init.func, "_partialmethod", None)
+    defaults = {}
+    for keywords in reversed(layers):
+        defaults.update(keywords)
+    return defaults
+
+
+def glyph_options(mob_class):
+    """The ``font_size`` and ``tex_template`` the glyphs of ``mob_class`` are built with."""
+    defaults = _defaults(mob_class)
+    options = {"font_size": defaults.get("font_size", DEFAULT_FONT_SIZE)}
+    if issubclass(mob_class, SingleStringMathTex):
+        options["tex_template"] = defaults.get("tex_template") or config.tex_template
+    return options
+
+
+def glyph_points(mob_class, string, options=None):
+    """The outline of ``mob_class(string)``, at DEFAULT_FONT_SIZE, as one point array."""
+    options = options or glyph_options(mob_class)
+    template = options.get("tex_template")
+    key = (mob_class, string, options["font_size"], template and template.body)
+    if key not in _atlas:
+        glyph = mob_class(string, **options)
+        points = np.concatenate([mob.points for mob in glyph.family_members_with_points()])
+        _atlas[key] = points * (DEFAULT_FONT_SIZE / options["font_size"])
+    return _atlas[key]
+
+
+class GlyphReadout(DecimalNumber):
+    """A :class:`DecimalNumber` whose value is set by moving atlas glyphs."""
+
+    def __init__(self, number=0, *args, include_background_rectangle=False, **kwargs):
+        if include_background_rectangle:
+            raise ValueError("GlyphReadout does not support include_background_rectangle")
+        self._num_string = None
+        super().__init__(number, *args, **kwargs)
+        # The characters every readout needs, laid out before the first frame.
+        options = glyph_options(self.mob_class)
+        for char in "0123456789-.+" if self.include_sign else "0123456789-.":
+            glyph_points(self.mob_class, char, options)
+
+    def _place(self):
+        """Point arrays of the characters of the number, at the initial font size."""
+        options = {cls: glyph_options(cls) for cls in (self.mob_class, SingleStringMathTex)}
+        chars = [(self.mob_class, char) for char in self._num_string]
+        if self.show_ellipsis:
+            chars.append((SingleStringMathTex, "\\dots"))
+        scale = self._font_size / DEFAULT_FONT_SIZE
+        buff = self.digit_buff_per_font_unit * self._font_size
+
+        # arrange(aligned_edge=DOWN): left to right, bottoms on y = 0.
+        pieces, x = [], 0.0
+        for mob_class, string in chars:
+            points = glyph_points(mob_class, string, options[mob_class]) * scale
+            low, high = points.min(axis=0), points.max(axis=0)
+            pieces.append(points + np.array([x - low[0], -low[1], 0]))
+            x += high[0] - low[0] + buff
+        if self.unit is not None:
+            # next_to(self, RIGHT, aligned_edge=DOWN): the unit sits on the same
+            # bottom line as the characters; "^" units are raised further down.
+            points = glyph_points(SingleStringMathTex, self.unit, options[SingleStringMathTex])
+            points = points * scale
+            low = points.min(axis=0)
+            unit_buff = self.unit_buff_per_font_unit * self._font_size
+            pieces.append(points + np.array([x + unit_buff - low[0], -low[1], 0]))
+
+        # move_to(ORIGIN)
+        all_points = np.concatenate(pieces)
+        center = (all_points.min(axis=0) + all_points.max(axis=0)) / 2
+        for points in pieces:
+            points -= center
+
+        for i, char in enumerate(self._num_string):
+            if char == "-" and i + 1 < len(self._num_string):
+                # Centered on the height of the next character.
+                following = pieces[i + 1][:, 1]
+                target = following.max() - np.ptp(following) / 2
+                pieces[i][:, 1] += target - pieces[i][:, 1].max()
+            elif char == ",":
+                pieces[i][:, 1] -= np.ptp(pieces[i][:, 1]) / 2
+        if self.unit is not None and self.unit.startswith("^"):
+            # unit_sign.align_to(self, UP)
+            top = max(points[:, 1].max() for points in pieces)
+            pieces[-1][:, 1] += top - pieces[-1][:, 1].max()
+        return pieces
+
+    def _set_submobjects_from_number(self, number):
+        self.number = number
+        self._num_string = self._get_num_string(number)
+        pieces = self._place()
+        while len(self.submobjects) < len(pieces):
+            slot = VMobject()
+            if self.submobjects:
+                slot.match_style(self.submobjects[0])
+            self.add(slot)
+        for i, slot in enumerate(self.submobjects):
+            if i < len(pieces):
+                slot.points = pieces[i]
+            else:
+                slot.clear_points()
+        if self.unit is not None:
+            self.unit_sign = self.submobjects[len(pieces) - 1]
+        self.initial_height = self.height
+
+    def set_value(self, number):
+        if self._get_num_string(number) == self._num_string:
+            self.number = number
+            return self
+        font_size = self.font_size
+        move_to_point = self.get_edge_center(self.edge_to_fix)
+        self._set_submobjects_from_number(number)
+        self.font_size = font_size
+        self.move_to(move_to_point, self.edge_to_fix)
+        return self
@@ -0,0 +1,191 @@
+"""Riemann sums backed by NumPy arrays.
+
+:meth:`Axes.get_riemann_rectangles` returns a ``VGroup`` with one
+``Rectangle`` per bar, each styled on its own. :class:`RiemannSum` computes
+all bar corners at once and stores every bar as a closed subpath of a single
+``VMobject``, with one horizontal color gradient for the whole sum. Refining
+a sum therefore costs a few array operations instead of building thousands
+of mobjects, and :func:`riemann_refinements` generates the refinements one at
+a time so only the bars on screen are ever alive. Animations treat the bars
+as those of a ``VGroup``: ``Create`` draws them all at once, and
+``Transform`` into a finer sum splits each bar into the bars replacing it::
+
+    refinements = riemann_refinements(
+        ax, function, [1, 11], [1 / i for i in range(1, 200)],
+        per_dx=lambda dx: {"stroke_width": min(dx, 1)},
+    )
+    r = next(refinements)
+    self.play(Create(r))
+    for finer in refinements:
+        self.play(Transform(r, finer))
+"""
+
+from __future__ import annotations
+
+import numpy as np
+from manim import BLACK, BLUE, GREEN, RIGHT, VMobject
+
+# Parameters of the four control points of a straight cubic Bézier curve.
+_BEZIER_ALPHAS = np.linspace(0, 1, 4)
+
+
+def _evaluate(function, xs):
+    """Evaluate ``function`` on the array ``xs``, vectorizing it if needed."""
+    try:
+        ys = np.asarray(function(xs), dtype=float)
+    except (TypeError, ValueError):
+        ys = None
+    if ys is None or ys.shape != xs.shape:
+        ys = np.vectorize(function, otypes=[float])(xs)
+    return ys
+
+
+def _de_casteljau(curves, t):
+    """The first and last control points of each level of de Casteljau's algorithm."""
+    heads, tails = [curves[:, 0]], [curves[:, -1]]
+    while curves.shape[1] > 1:
+        curves = curves[:, :-1] + t * (curves[:, 1:] - curves[:, :-1])
+        heads.append(curves[:, 0])
+        tails.append(curves[:, -1])
+    return heads, tails
+
+
+def _partial_curves(curves, a, b):
+    """The part between ``a`` and ``b`` of each cubic curve of ``curves`` (n, 4, 3)."""
+    _, tails = _de_casteljau(curves, a)
+    curves = np.stack(tails[::-1], axis=1)
+    heads, _ = _de_casteljau(curves, 0 if a >= 1 else (b - a) / (1 - a))
+    return np.stack(heads, axis=1)
+
+
+class RiemannSum(VMobject):
+    """The Riemann sum of ``function`` over ``x_range``, as a single mobject.
+
+    Takes the same arguments as :meth:`Axes.get_riemann_rectangles`, except
+    that ``graph`` may also be a plain (preferably vectorized) function and
+    signed areas are not recolored. ``stroke_color=None`` strokes the bars
+    with their fill gradient.
+    """
+
+    def __init__(
+        self,
+        ax,
+        graph,
+        x_range,
+        dx=0.1,
+        input_sample_type="left",
+        stroke_width=1,
+        stroke_color=BLACK,
+        fill_opacity=1,
+        color=(BLUE, GREEN),
+        width_scale_factor=1.001,
+        **kwargs,
+    ):
+        self.ax = ax
+        self.function = getattr(graph, "underlying_function", graph)
+        self.x_range = tuple(x_range[:2])
+        self.dx = dx
+        self.input_sample_type = input_sample_type
+        self.width_scale_factor = width_scale_factor
+        super().__init__(**kwargs)
+
+        colors = list(color) if isinstance(color, (list, tuple)) else [color]
+        self.set_sheen_direction(RIGHT)
+        self.set_fill(colors, opacity=fill_opacity)
+        self.set_stroke(stroke_color or colors, width=stroke_width)
+
+    @property
+    def num_bars(self):
+        return len(self.points) // 16
+
+    def generate_points(self):
+        dx = self.dx
+        xs = np.arange(*self.x_range, dx)
+        offsets = {"left": 0.0, "right": dx, "center": 0.5 * dx}
+        if self.input_sample_type not in offsets:
+            raise ValueError("Invalid input sample type")
+
+        ys = _evaluate(self.function, xs + offsets[self.input_sample_type])
+        base = np.full_like(xs, self.ax._origin_shift(self.ax.y_range))
+        x_ends = xs + self.width_scale_factor * dx
+
+        # Corners of every bar, counterclockwise from the bottom left: (n, 4, 2)
+        coords = np.stack(
+            [
+                np.stack([xs, x_ends, x_ends, xs], axis=1),
+                np.stack([base, base, ys, ys], axis=1),
+            ],
+            axis=-1,
+        )
+        corners = np.asarray(
+            self.ax.coords_to_point(coords[..., 0].ravel(), coords[..., 1].ravel())
+        ).T.reshape(len(xs), 4, 3)
+
+        # Each side is a straight cubic curve: (n, 4 sides, 4 control points, 3)
+        ends = np.roll(corners, -1, axis=1)
+        sides = corners[:, :, None] + _BEZIER_ALPHAS[:, None] * (ends - corners)[:, :, None]
+        self.points = sides.reshape(-1, 3)
+
+    def _repeat_bars(self, count):
+        """Repeat bars in place, as ``add_n_more_submobjects`` repeats submobjects."""
+        bars = self.points.reshape(self.num_bars, -1, 3)
+        self.points = bars[np.arange(count) * len(bars) // count].reshape(-1, 3)
+
+    def align_points(self, vmobject):
+        # VMobject.align_points would subdivide the curves of the coarser sum and
+        # add point-sized subpaths at its end: bars would slide and shrink, and the
+        # new ones grow from the right. Split each bar into the bars replacing it,
+        # like the rectangles of Axes.get_riemann_rectangles are.
+        if (
+            isinstance(vmobject, RiemannSum)
+            and self.num_bars
+            and vmobject.num_bars
+            and not len(self.points) % 16
+            and not len(vmobject.points) % 16
+        ):
+            count = max(self.num_bars, vmobject.num_bars)
+            for mob in (self, vmobject):
+                if mob.num_bars < count:
+                    mob._repeat_bars(count)
+        return super().align_points(vmobject)
+
+    def pointwise_become_partial(self, vmobject, a, b):
+        # Draw the outline of every bar at once, as Create draws each rectangle
+        # of a VGroup, rather than the bars one after the other.
+        if not isinstance(vmobject, RiemannSum) or len(vmobject.points) % 16:
+            return super().pointwise_become_partial(vmobject, a, b)
+        if a <= 0 and b >= 1:
+            self.points = vmobject.points.copy()
+            return self
+        sides = vmobject.points.reshape(-1, 4, 4, 3)
+        start, end = 4 * a, 4 * b
+        first = min(int(start), 3)
+        last = min(max(first, int(np.ceil(end)) - 1), 3)
+        pieces = [
+            _partial_curves(sides[:, i], np.clip(start - i, 0, 1), np.clip(end - i, 0, 1))
+            for i in range(first, last + 1)
+        ]
+        self.points = np.stack(pieces, axis=1).reshape(-1, 3)
+        return self
+
+    def refine(self, dx):
+        """Return a new sum over the same range with bar width ``dx``."""
+        return RiemannSum(
+            self.ax,
+            self.function,
+            self.x_range,
+            dx=dx,
+            input_sample_type=self.input_sample_type,
+            width_scale_factor=self.width_scale_factor,
+        ).match_style(self)
+
+
+def riemann_refinements(ax, graph, x_range, dxs, per_dx=None, **kwargs):
+    """Yield a :class:`RiemannSum` for each bar width in ``dxs``, lazily.
+
+    ``per_dx``, if given, maps a bar width to more keyword arguments for its
+    sum, such as a stroke that thins out with the bars.
+    """
+    for dx in dxs:
+        options = {**kwargs, **per_dx(dx)} if per_dx else kwargs
+        yield RiemannSum(ax, graph, x_range, dx=dx, **options)
@@ -0,0 +1,97 @@
+"""Command line plumbing shared by the ``deck`` tools.
+
+The tools load a scene file and configure manim the way ``manim -q<x>``
+would, possibly in worker processes, so the options travel as a plain dict.
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+from manim import config
+from manim.utils.module_ops import get_module
+
+QUALITIES = {
+    "l": "low_quality",
+    "m": "medium_quality",
+    "h": "high_quality",
+    "p": "production_quality",
+    "k": "fourk_quality",
+}
+
+
+def add_scene_arguments(parser):
+    """Add the scene file, scene name and render options to ``parser``."""
+    parser.add_argument("file", type=Path, help="Python file defining the scene.")
+    parser.add_argument("scene", help="Name of the scene class to render.")
+    add_render_arguments(parser)
+
+
+def add_render_arguments(parser):
+    """Add the render options to ``parser``."""
+    parser.add_argument(
+        "-q",
+        "--quality",
+        choices=QUALITIES,
+        default="h",
+        help="Render quality, as manim's -q flag (default: h).",
+    )
+    parser.add_argument("--media-dir", help="Same as manim's --media_dir.")
+    parser.add_argument(
+        "-v", "--verbosity", default="WARNING", help="manim's verbosity (default: WARNING)."
+    )
+
+
+def render_options(args):
+    """Extract the render options from parsed arguments."""
+    return {
+        "quality": args.quality,
+        "media_dir": args.media_dir,
+        "verbosity": args.verbosity,
+    }
+
+
+# Config entries copied into worker processes spawned during a render.
+SNAPSHOT_KEYS = (
+    "pixel_width",
+    "pixel_height",
+    "frame_rate",
+    "media_dir",
+    "format",
+    "background_opacity",
+    "disable_caching",
+    "verbosity",
+)
+
+
+def snapshot_options():
+    """Render options reproducing the current ``config`` in another process."""
+    return {"config": {key: config[key] for key in SNAPSHOT_KEYS}}
+
+
+def configure(options):
+    """Apply render options to manim's global ``config``."""
+    if options.get("quality"):
+        config.quality = QUALITIES[options["quality"]]
+    if options.get("media_dir"):
+        config.media_dir = options["media_dir"]
+    config.verbosity = options.get("verbosity", "WARNING")
+    for key, value in options.get("config", {}).items():
+        config[key] = value
+    config.progress_bar = "none"
+
+
+def load_module(file):
+    """Import the scene file ``file`` as manim does."""
+    file = Path(file)
+    config.input_file = str(file)
+    return get_module(file)
+
+
+def load_scene(file, name):
+    """Import ``file`` as manim does and return its scene class ``name``."""
+    module = load_module(file)
+    try:
+        return getattr(module, name)
+    except AttributeError:
+        raise SystemExit(f"{file} does not define a scene named {name!r}") from None
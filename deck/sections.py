@@ -0,0 +1,125 @@
+"""Sectioned slides: a ``construct`` split into named, ordered sections."""
+
+from __future__ import annotations
+
+from manim_slides import Slide
+
+
+def jump_to_end(scene, *animations, **play_kwargs):
+    """Apply a play call straight to its end state, advancing the clock only.
+
+    Nothing is rasterized, hashed or encoded: the animations are compiled,
+    begun, jumped to ``alpha = 1`` and finished, and the renderer's clock is
+    advanced by their run time. The play counter is left alone.
+    """
+    for key in ("subcaption", "subcaption_duration", "subcaption_offset"):
+        play_kwargs.pop(key, None)
+
+    scene.compile_animation_data(*animations, **play_kwargs)
+    finish_animations(scene)
+    scene.renderer.time += scene.duration
+
+
+def finish_animations(scene):
+    """Apply the animations compiled by ``scene`` straight to their end state.
+
+    The part of :func:`jump_to_end` after ``compile_animation_data``; the
+    clock is left alone.
+    """
+    scene.begin_animations()
+    if not scene.is_current_animation_frozen_frame():
+        scene.update_to_time(scene.get_run_time(scene.animations))
+        for animation in scene.animations:
+            animation.finish()
+            animation.clean_up_from_scene(scene)
+    scene.renderer.static_image = None
+
+
+def fast_forward(scene, *animations, **play_kwargs):
+    """Apply a play call straight to its end state.
+
+    Like :func:`jump_to_end`, but the renderer's play counter is advanced as
+    if the call had been rendered. The caller is responsible for registering
+    a partial movie file (or ``None``) so that
+    ``file_writer.partial_movie_files`` stays aligned with ``num_plays``.
+    """
+    jump_to_end(scene, *animations, **play_kwargs)
+    scene.renderer.num_plays += 1
+
+
+class SectionedSlide(Slide):
+    """A :class:`Slide` whose ``construct`` is a fixed sequence of methods.
+
+    Subclasses list the method names in :attr:`sections`; each one is run
+    through :meth:`run_section`, which is the hook the other ``deck`` mixins
+    use to tag, skip or reuse whole sections.
+    """
+
+    sections: tuple[str, ...] = ()
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.current_section: str | None = None
+        self._replayed_files: list[str | None] | None = None
+        self._replayed_count = 0
+
+    def construct(self):
+        for name in self.sections:
+            self.run_section(name)
+
+    def run_section(self, name):
+        """Run the section method called ``name``.
+
+        Mixins override this to wrap whole sections; :meth:`replay_section`
+        bypasses the overrides and calls :meth:`_call_section` directly.
+        """
+        self._call_section(name)
+
+    def _call_section(self, name):
+        self.current_section = name
+        getattr(self, name)()
+
+    def replay_section(self, name, partial_movie_files):
+        """Run a section without rendering it.
+
+        Every play is fast-forwarded to its end state and registered with the
+        matching entry of ``partial_movie_files`` (renderer hashes, one per
+        play) instead of a freshly rendered file. Returns ``False`` if the
+        section did not play exactly that many animations, in which case the
+        extra plays were left without a movie file and the given files cannot
+        be used for this section.
+        """
+        self._replayed_files = list(partial_movie_files)
+        self._replayed_count = 0
+        try:
+            self._call_section(name)
+        finally:
+            replayed_files, self._replayed_files = self._replayed_files, None
+        return self._replayed_count == len(replayed_files)
+
+    def fast_forward_section(self, name):
+        """Run a section to its end state without rendering anything."""
+        self.replay_section(name, [])
+
+    @property
+    def fast_forwarding(self):
+        """Whether plays are applied to their end state instead of rendered."""
+        return self._replayed_files is not None
+
+    def play(self, *args, **kwargs):
+        if self._replayed_files is None:
+            return super().play(*args, **kwargs)
+
+        fast_forward(self, *args, **kwargs)
+        self._register_replayed_play()
+
+    def _register_replayed_play(self):
+        """Register the next replayed file for a play that was fast-forwarded."""
+        index = self._replayed_count
+        partial_movie_file = (
+            self._replayed_files[index] if index < len(self._replayed_files) else None
+        )
+        self._replayed_count += 1
+        self.renderer.file_writer.add_partial_movie_file(partial_movie_file)
+        self.renderer.animations_hashes.append(partial_movie_file)
+        self._current_animation += 1
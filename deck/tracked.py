@@ -0,0 +1,178 @@
+"""Tracker-driven mobjects that are built once and updated in place.
+
+``always_redraw`` rebuilds its mobject from scratch on every frame, which
+means new ``Dot``, ``Line``, ``DashedLine`` or ``DecimalNumber`` instances
+(and their point arrays, colors and submobjects) sixty times per second.
+The helpers below cover the common cases of our decks instead: they create
+their mobjects once and attach an updater that only moves them or rewrites
+their point arrays from the current value of a
+:class:`~manim.mobject.value_tracker.ValueTracker`.
+
+They are drop-in replacements, e.g.::
+
+    moving_dot = tracked_dot(ax, function, k, color=BLACK)
+    moving_slope = tracked_secant(ax, function, k, dx=0.05,
+                                  secant_line_length=1.5, secant_line_color=RED)
+"""
+
+from __future__ import annotations
+
+import numpy as np
+from manim import (
+    DEFAULT_DASH_LENGTH,
+    GREEN,
+    LEFT,
+    RIGHT,
+    YELLOW,
+    Dot,
+    Line,
+    VGroup,
+    VMobject,
+)
+
+from .readout import GlyphReadout
+
+# Parameters of the four control points of a straight cubic Bézier curve.
+_BEZIER_ALPHAS = np.linspace(0, 1, 4)
+
+
+def _put_line_on(line, start, end):
+    """Rewrite ``line``'s points as the straight segment ``start``-``end``."""
+    line.points = start + _BEZIER_ALPHAS[:, None] * (end - start)
+    return line
+
+
+class DashedSegment(VMobject):
+    """A dashed straight line drawn as a single mobject.
+
+    Unlike :class:`~manim.mobject.geometry.line.DashedLine`, which holds one
+    submobject per dash, every dash is a subpath of this mobject's point
+    array, so moving the segment is one vectorized assignment. The dash
+    pattern matches ``DashedLine`` for the same ``dash_length`` and
+    ``dashed_ratio``.
+    """
+
+    def __init__(
+        self,
+        start=LEFT,
+        end=RIGHT,
+        dash_length=DEFAULT_DASH_LENGTH,
+        dashed_ratio=0.5,
+        **kwargs,
+    ):
+        self.dash_length = dash_length
+        self.dashed_ratio = dashed_ratio
+        super().__init__(**kwargs)
+        self.put_start_and_end_on(start, end)
+
+    def put_start_and_end_on(self, start, end):
+        start = np.asarray(start, dtype=float)
+        end = np.asarray(end, dtype=float)
+        length = np.linalg.norm(end - start)
+        num_dashes = max(2, int(np.ceil(length / self.dash_length * self.dashed_ratio)))
+
+        dash = self.dashed_ratio / num_dashes
+        period = dash + (1 - self.dashed_ratio) / (num_dashes - 1)
+        alphas = np.arange(num_dashes)[:, None] * period + dash * _BEZIER_ALPHAS
+        self.points = start + alphas.reshape(-1, 1) * (end - start)
+        return self
+
+
+def tracked_marker(mobject, point):
+    """Keep ``mobject`` centered on ``point()``, moving it instead of rebuilding it."""
+    mobject.add_updater(lambda m: m.move_to(point()), call_updater=True)
+    return mobject
+
+
+def tracked_dot(ax, graph, tracker, **kwargs):
+    """A :class:`Dot` on ``graph`` at ``x = tracker.get_value()``."""
+    return tracked_marker(
+        Dot(**kwargs), lambda: ax.input_to_graph_point(tracker.get_value(), graph)
+    )
+
+
+def tracked_number(tracker, point, **kwargs):
+    """A single :class:`.GlyphReadout` showing ``tracker``'s value at ``point()``."""
+    number = GlyphReadout(tracker.get_value(), **kwargs)
+    number.add_updater(
+        lambda m: m.set_value(tracker.get_value()).move_to(point()), call_updater=True
+    )
+    return number
+
+
+def tracked_secant(
+    ax,
+    graph,
+    tracker,
+    dx=None,
+    dx_line_color=YELLOW,
+    dy_line_color=None,
+    secant_line_color=GREEN,
+    secant_line_length=10,
+):
+    """In-place counterpart of :meth:`Axes.get_secant_slope_group` (without labels).
+
+    Returns a ``VGroup(dx_line, df_line, secant_line)`` following
+    ``x = tracker.get_value()``; the lines are also available as attributes.
+    """
+    dx = dx or float(ax.x_range[1] - ax.x_range[0]) / 10
+    group = VGroup(
+        Line(color=dx_line_color),
+        Line(color=dy_line_color or graph.get_color()),
+        Line(color=secant_line_color),
+    )
+    group.dx_line, group.df_line, group.secant_line = group.submobjects
+
+    def update(group):
+        x = tracker.get_value()
+        p1 = ax.input_to_graph_point(x, graph)
+        p2 = ax.input_to_graph_point(x + dx, graph)
+        interim_point = np.array([p2[0], p1[1], p1[2]])
+        _put_line_on(group.dx_line, p1, interim_point)
+        _put_line_on(group.df_line, interim_point, p2)
+
+        half = (p2 - p1) * secant_line_length / (2 * np.linalg.norm(p2 - p1))
+        center = (p1 + p2) / 2
+        _put_line_on(group.secant_line, center - half, center + half)
+
+    group.add_updater(update, call_updater=True)
+    return group
+
+
+def tracked_tangent(ax, graph, tracker, length=1, dx=1e-3, **kwargs):
+    """A :class:`Line` of given ``length`` tangent to ``graph`` at ``tracker``'s value."""
+    line = Line(**kwargs)
+
+    def update(line):
+        x = tracker.get_value()
+        point = ax.input_to_graph_point(x, graph)
+        direction = ax.input_to_graph_point(x + dx, graph) - ax.input_to_graph_point(
+            x - dx, graph
+        )
+        half = direction * length / (2 * np.linalg.norm(direction))
+        _put_line_on(line, point - half, point + half)
+
+    line.add_updater(update, call_updater=True)
+    return line
+
+
+def tracked_lines_to_point(ax, point, color=None, stroke_width=2, **kwargs):
+    """In-place counterpart of :meth:`Axes.get_lines_to_point` for ``point()``.
+
+    Returns ``VGroup(horizontal_line, vertical_line)`` of
+    :class:`DashedSegment`; extra keyword arguments go to the segments.
+    """
+    if color is not None:
+        kwargs["color"] = color
+    group = VGroup(
+        DashedSegment(stroke_width=stroke_width, **kwargs),
+        DashedSegment(stroke_width=stroke_width, **kwargs),
+    )
+
+    def update(group):
+        p = np.asarray(point(), dtype=float)
+        for index, line in zip((1, 0), group.submobjects):
+            line.put_start_and_end_on(ax.get_axis(index).get_projection(p), p)
+
+    group.add_updater(update, call_updater=True)
+    return group
@@ -0,0 +1,205 @@
+"""Export a deck as a lazily loaded web presentation.
+
+Usage::
+
+    python -m deck.web TeachingDemo _site
+
+``manim-slides convert`` writes one HTML page that lists every slide for
+reveal.js, and with ``--data-uri`` (or ``media_embed``) it also carries the
+videos inside, so the page has to arrive before the first slide shows. This
+exporter writes instead, under the destination folder:
+
+- ``segments/``: one file per slide, named after its content hash, with the
+  MP4 index moved to the front (``-movflags +faststart``) so that browsers
+  can start playing and seek with range requests before the download ends;
+- ``posters/``: a small JPEG of the first frame of each slide, shown while
+  its video loads (``--no-posters`` to skip them);
+- ``manifest.json``: the slides in order, with their files, posters and
+  Manim Slides options (loop, auto next, playback rate, notes);
+- ``index.html``, ``player.js`` and ``sw.js``: a small player (see
+  ``deck/player``) that only loads the current and next slides, and a
+  service worker that keeps the segments seen so far in a cache, answers
+  range requests from it, and drops the segments the manifest no longer
+  lists.
+
+Segments and posters already exported with the same content are kept, so
+re-exporting after a partial re-render only copies the slides that changed.
+
+The player only has keyboard and click navigation: it has none of the
+reveal.js controls, touch and swipe navigation or speaker notes view of
+``manim-slides convert``, which :func:`export_reveal` runs and which stays
+the default of :mod:`deck.batch` and the Pages workflow.
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import html
+import json
+import os
+import shutil
+import subprocess
+import sys
+from pathlib import Path
+from string import Template
+
+from manim import config, logger
+from manim_slides.config import PresentationConfig
+
+PLAYER_DIR = Path(__file__).parent / "player"
+FASTSTART_SUFFIXES = (".mp4", ".mov")
+
+
+def file_digest(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(2**20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _ffmpeg(*args):
+    # manim 0.19 dropped the setting along with its ffmpeg pipe.
+    ffmpeg = getattr(config, "ffmpeg_executable", "ffmpeg")
+    subprocess.run([ffmpeg, "-y", "-loglevel", "error", *map(str, args)], check=True)
+
+
+def export_segment(source, destination):
+    """Copy a slide video, with its index at the front when the format has one."""
+    partial = destination.with_name(f".{destination.name}")
+    if source.suffix in FASTSTART_SUFFIXES:
+        _ffmpeg("-i", source, "-c", "copy", "-movflags", "+faststart", partial)
+    else:
+        shutil.copyfile(source, partial)
+    os.replace(partial, destination)
+
+
+def export_poster(source, destination, width):
+    """Save the first frame of a slide video as a JPEG ``width`` pixels wide."""
+    partial = destination.with_name(f".{destination.name}")
+    _ffmpeg("-i", source, "-frames:v", "1", "-vf", f"scale={width}:-2", "-q:v", "5", partial)
+    os.replace(partial, destination)
+
+
+def export_web(
+    scenes, destination, folder=Path("slides"), posters=True, poster_width=480, title="Manim Slides"
+):
+    """Export the presentations of ``scenes`` to the folder ``destination``."""
+    destination = Path(destination)
+    (destination / "segments").mkdir(parents=True, exist_ok=True)
+    if posters:
+        (destination / "posters").mkdir(exist_ok=True)
+
+    presentations = [
+        PresentationConfig.from_file(Path(folder) / f"{scene}.json") for scene in scenes
+    ]
+    slides, exported = [], 0
+    for presentation in presentations:
+        for slide in presentation.slides:
+            name = file_digest(slide.file)[:16]
+            segment = Path("segments") / f"{name}{slide.file.suffix}"
+            if not (destination / segment).exists():
+                export_segment(slide.file, destination / segment)
+                exported += 1
+            entry = {
+                "file": segment.as_posix(),
+                "poster": None,
+                "background_color": presentation.background_color.as_hex(),
+                "loop": slide.loop,
+                "auto_next": slide.auto_next,
+                "playback_rate": slide.playback_rate,
+                "notes": slide.notes,
+                "size": (destination / segment).stat().st_size,
+            }
+            if posters:
+                poster = Path("posters") / f"{name}-{poster_width}.jpg"
+                if not (destination / poster).exists():
+                    export_poster(slide.file, destination / poster, poster_width)
+                entry["poster"] = poster.as_posix()
+            slides.append(entry)
+
+    manifest = {
+        "title": title,
+        "resolution": list(presentations[0].resolution),
+        "slides": slides,
+    }
+    (destination / "manifest.json").write_text(json.dumps(manifest, indent=2))
+
+    first = slides[0]
+    # The first poster shows before the manifest and the player arrive.
+    poster = f'<img class="current" src="{first["poster"]}" alt="" />' if first["poster"] else ""
+    page = Template((PLAYER_DIR / "index.html").read_text()).substitute(
+        title=html.escape(title),
+        background_color=first["background_color"],
+        first_poster=poster,
+    )
+    (destination / "index.html").write_text(page)
+    for name in ("player.js", "sw.js"):
+        shutil.copyfile(PLAYER_DIR / name, destination / name)
+
+    kept = {slide["file"] for slide in slides} | {slide["poster"] for slide in slides}
+    _prune(destination, kept)
+    logger.info(f"Exported {len(slides)} slides to '{destination}' ({exported} new segments)")
+
+
+def export_reveal(scenes, destination, folder=Path("slides"), title="Manim Slides"):
+    """Export the presentations of ``scenes`` with ``manim-slides convert``."""
+    destination = Path(destination)
+    destination.mkdir(parents=True, exist_ok=True)
+    subprocess.run(
+        [
+            sys.executable,
+            "-m",
+            "manim_slides",
+            "convert",
+            "--folder",
+            str(folder),
+            *scenes,
+            str(destination / "index.html"),
+            f"-ctitle={title}",
+        ],
+        check=True,
+    )
+
+
+def _prune(destination, kept):
+    """Remove segments and posters of earlier exports."""
+    for directory in ("segments", "posters"):
+        for path in (destination / directory).glob("*"):
+            if path.relative_to(destination).as_posix() not in kept:
+                path.unlink()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m deck.web", description=__doc__.splitlines()[0]
+    )
+    parser.add_argument("scenes", nargs="+", help="Scenes to export, in order.")
+    parser.add_argument("destination", type=Path, help="Folder to write the site to.")
+    parser.add_argument(
+        "--folder",
+        type=Path,
+        default=Path("slides"),
+        help="Folder holding the Manim Slides presentation files (default: slides).",
+    )
+    parser.add_argument(
+        "--no-posters", dest="posters", action="store_false", help="Do not write posters."
+    )
+    parser.add_argument(
+        "--poster-width", type=int, default=480, help="Poster width in pixels (default: 480)."
+    )
+    parser.add_argument("--title", default="Manim Slides", help="Page title.")
+    args = parser.parse_args(argv)
+    export_web(
+        args.scenes,
+        args.destination,
+        folder=args.folder,
+        posters=args.posters,
+        poster_width=args.poster_width,
+        title=args.title,
+    )
+
+
+if __name__ == "__main__":
+    main()
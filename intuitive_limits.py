@@ -2,11 +2,34 @@ from manim import *
 from manim_slides import Slide
 import numpy as np
 
+from deck import (CoalescingSlide, DraftSlide, FrameSplitSlide, HoldSlide,
+                  IncrementalSlide, LifecycleSlide, ProfiledSlide, glyph_cache)
+from deck.geometry import cached_axes, cached_function_plot
+from deck.plotting import FunctionPlot
+from deck.readout import GlyphReadout
+from deck.riemann import riemann_refinements
+from deck.tracked import (tracked_dot, tracked_lines_to_point, tracked_marker,
+                          tracked_number, tracked_secant)
+
 config.background_color = WHITE
 config.media_embed = True
 
+# Reuse laid out Text/Tex/MathTex across renders (see deck/glyph_cache.py)
+glyph_cache.install()
+
 # %%manim_slides -v WARNING --progress_bar None TeachingDemo --manim-slides controls=true
-class TeachingDemo(Slide):
+class TeachingDemo(ProfiledSlide, DraftSlide, LifecycleSlide, HoldSlide, CoalescingSlide,
+                   FrameSplitSlide, IncrementalSlide):
+    # Sections are rendered in this order; unchanged ones are reused
+    # from the previous render (see deck/incremental.py).
+    sections = ("construct_title",
+                "construct_objectives",
+                "construct_intro_to_limits",
+                "construct_conceptualizing_limits",
+                "construct_limit_difference",
+                "construct_limit_difference2",
+                "construct_summary")
+
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         
@@ -21,15 +44,6 @@ class TeachingDemo(Slide):
         Axes.set_default(axis_config={"color": BLACK,
                                         "include_numbers": True})
 
-    def construct(self):
-         self.construct_title()
-         self.construct_objectives()
-         self.construct_intro_to_limits()
-         self.construct_conceptualizing_limits()
-         self.construct_limit_difference()
-         self.construct_limit_difference2()
-         self.construct_summary()
-
     def construct_title(self):
 
         # Empty first Frame
@@ -133,20 +147,11 @@ class TeachingDemo(Slide):
 
         k = ValueTracker(-3/2*np.pi)
         function = ax.plot(lambda x: np.sin(x), x_range=[-6,6,1], color=BLUE)
-        moving_slope = always_redraw(
-            lambda: ax.get_secant_slope_group(
-                x = k.get_value(),
-                graph = function,
-                dx = 0.05,
-                secant_line_length=1.5,
-                secant_line_color=RED
-            )
-        )
-        moving_dot = always_redraw(
-            lambda: Dot(color=BLACK).move_to(
-                ax.c2p(k.get_value(), function.underlying_function(k.get_value()))
-            )
-        )
+        moving_slope = tracked_secant(ax, function, k,
+                                      dx=0.05,
+                                      secant_line_length=1.5,
+                                      secant_line_color=RED)
+        moving_dot = tracked_dot(ax, function, k, color=BLACK)
         self.play(Create(box), Create(ax), Create(function))
         self.play(Create(moving_slope), Create(moving_dot))
         self.play(k.animate.set_value(3/2*np.pi), run_time=5, rate_func=linear)
@@ -161,25 +166,24 @@ class TeachingDemo(Slide):
                     axis_config={"color": BLACK}).move_to(box.get_center())
 
         function = ax.plot(lambda x: 0.7*np.sqrt(x), x_range=[0,12,0.05], color=BLACK)
-        rectangles = VGroup(*[
-                    ax.get_riemann_rectangles(
-                        function,
-                        x_range=[1,11],
-                        dx=dx,
-                        input_sample_type='left',
-                        stroke_width=dx if dx > 0.1 else 0.8
-                    ).set_color_by_gradient(BLUE, GREEN).set_stroke(color=BLACK if dx > 0.1 else None)
-                    for dx in [1/(i) for i in range(1,10)]
-        ])
-        r = rectangles[0]
-
-        self.play(Create(box), Create(ax), Create(function), Create(r))
-        for rect in rectangles[1:]:
-            self.play(Transform(r, rect))
-            self.wait(0.3)
-        self.next_slide()
-
-        self.integ_group = VGroup(box, ax, function, rectangles)
+        # refinements are generated one at a time as the animation needs them
+        refinements = riemann_refinements(
+            ax, function, x_range=[1,11], dxs=[1/(i) for i in range(1,10)],
+            input_sample_type='left',
+            per_dx=lambda dx: {"stroke_width": dx if dx > 0.1 else 0.8,
+                               "stroke_color": BLACK if dx > 0.1 else None}
+        )
+        r = next(refinements)
+
+        # one partial movie file for the whole slide (see deck/coalesce.py)
+        with self.coalesce():
+            self.play(Create(box), Create(ax), Create(function), Create(r))
+            for rect in refinements:
+                self.play(Transform(r, rect))
+                self.wait(0.3)
+            self.next_slide()
+
+        self.integ_group = VGroup(box, ax, function, r)
 
     def construct_conceptualizing_limits(self):
         # Conceptualizing Limits
@@ -204,15 +208,14 @@ class TeachingDemo(Slide):
         self.next_slide()
 
         # (2.2) Plot
-        ax = Axes(x_range=[-3, 3, 1], y_range=[0, 6, 1],
-                    tips=False).to_edge(RIGHT)
+        # built once, copied in construct_limit_difference (see deck/geometry.py)
+        ax = cached_axes(x_range=[-3, 3, 1], y_range=[0, 6, 1],
+                         tips=False).to_edge(RIGHT)
         ax.get_x_axis().numbers.set_color(BLACK)
         ax.get_y_axis().numbers.set_color(BLACK)
-        function = ax.plot(lambda x: x**2+x+1, x_range=[-2,2,1], color=WHITE)
-        graph1 = ax.plot(lambda x: (x**3-1)/(x-1), x_range=[-2, 0.97, 1], color=BLUE)
-        graph2 = ax.plot(lambda x: (x**3-1)/(x-1), x_range=[1.03, 2, 0.05], color=BLUE)
-        break_point = Circle(radius=0.10, color=BLUE).move_to(ax.c2p(1,3))
-        func_graph = VGroup(graph1, break_point, graph2)
+        # split at the hole in x = 1, with an open circle there
+        func_graph = cached_function_plot(ax, lambda x: (x**3-1)/(x-1), x_range=[-2, 2, 1],
+                                          color=BLUE, hole_radius=0.10)
         self.play(Create(ax), Create(func_graph))
         self.next_slide()
 
@@ -226,26 +229,22 @@ class TeachingDemo(Slide):
 
         # (2.4) Moving line, points, and value
         t = ValueTracker(0.1)
-        moving_dot = always_redraw(
-            lambda: Dot(color=BLACK).move_to(
-                ax.c2p(t.get_value(), 0)
-            )
+        # the sweeps pass through x = 1: follow the continuous extension of f
+        extension = lambda x: x**2 + x + 1
+        moving_dot = tracked_marker(Dot(color=BLACK),
+                                    lambda: ax.c2p(t.get_value(), 0))
+        dotted_lines = tracked_lines_to_point(
+            ax,
+            lambda: ax.c2p(t.get_value(), extension(t.get_value())),
+            color=BLACK
         )
-        dotted_lines = always_redraw(
-            lambda: ax.get_lines_to_point(
-                ax.c2p(t.get_value(), function.underlying_function(t.get_value())),
-                color=BLACK
-            )
+        moving_xmark = tracked_marker(
+            Cross(color=RED, scale_factor=0.1),
+            lambda: ax.c2p(0, extension(t.get_value()))
         )
-        moving_xmark = always_redraw(
-            lambda: Cross(color=RED, scale_factor=0.1).move_to(
-                ax.c2p(0, function.underlying_function(t.get_value()))
-            )
-        )
-        updating_value = always_redraw(
-            lambda: DecimalNumber(num_decimal_places=2, font_size=1.5*self.SUBTITLE_FONT_SIZE, color=BLACK)
-            .set_value(t.get_value())
-            .move_to(ax.c2p(t.get_value()-0.25, 0.25))
+        updating_value = tracked_number(
+            t, lambda: ax.c2p(t.get_value()-0.25, 0.25),
+            num_decimal_places=2, font_size=1.5*self.SUBTITLE_FONT_SIZE, color=BLACK
         )
         updating_lines_and_points = VGroup(moving_dot, dotted_lines, moving_xmark, updating_value)
 
@@ -309,6 +308,7 @@ class TeachingDemo(Slide):
             [[0.90, 0.99, 0.999, 0.9999, 1.0001, 1.001, 1.01, 1.1],
             [2.7100, 2.9701, 2.9970, 2.9997, 3.0003, 3.0030, 3.3031, 3.31]],
             row_labels=[MathTex(r"x"), MathTex(r"f(x)")],
+            element_to_mobject=GlyphReadout,
             element_to_mobject_config={"num_decimal_places": 4, "color": BLACK,
                                         "font_size": 0.75*48},
             line_config={"color": BLACK},
@@ -323,27 +323,29 @@ class TeachingDemo(Slide):
         for values in [left_x, right_x, left_y, right_y]:
             values.set_color(WHITE)
 
-        self.play(Create(table))
-        self.next_slide()
-        self.play(left_x.animate.set_color(BLACK))
-        self.next_slide()
-        
-        self.play(left_y[0].animate.set_color(BLACK))
-        self.next_slide()
-        self.play(left_y[1].animate.set_color(BLACK))
-        self.next_slide()
-        self.play(left_y[2].animate.set_color(BLACK))
-        self.next_slide()
-        self.play(left_y[3].animate.set_color(BLACK))
-        self.next_slide()
-        
-        for mobj in right_x[::-1]:
-            self.play(mobj.animate.set_color(BLACK), run_time=2/len(right_x))
-        self.next_slide()
-
-        for i in reversed(range(4)):
-            self.play(right_y[i].animate.set_color(BLACK), run_time=1)
-        self.next_slide()
+        # one partial movie file per slide (see deck/coalesce.py)
+        with self.coalesce():
+            self.play(Create(table))
+            self.next_slide()
+            self.play(left_x.animate.set_color(BLACK))
+            self.next_slide()
+
+            self.play(left_y[0].animate.set_color(BLACK))
+            self.next_slide()
+            self.play(left_y[1].animate.set_color(BLACK))
+            self.next_slide()
+            self.play(left_y[2].animate.set_color(BLACK))
+            self.next_slide()
+            self.play(left_y[3].animate.set_color(BLACK))
+            self.next_slide()
+
+            for mobj in right_x[::-1]:
+                self.play(mobj.animate.set_color(BLACK), run_time=2/len(right_x))
+            self.next_slide()
+
+            for i in reversed(range(4)):
+                self.play(right_y[i].animate.set_color(BLACK), run_time=1)
+            self.next_slide()
 
         self.table = table
 
@@ -367,20 +369,19 @@ class TeachingDemo(Slide):
         self.next_slide()
 
         # Showing Graph
-        ax = Axes(x_range=[-3, 3, 1], y_range=[0, 6, 1],
-                    tips=False).to_edge(RIGHT)
+        ax = cached_axes(x_range=[-3, 3, 1], y_range=[0, 6, 1],
+                         tips=False).to_edge(RIGHT)
         ax.get_x_axis().numbers.set_color(BLACK)
         ax.get_y_axis().numbers.set_color(BLACK)
-        graph1 = ax.plot(lambda x: (x**3-1)/(x-1), x_range=[-2, 0.97, 1], color=BLUE)
-        graph2 = ax.plot(lambda x: (x**3-1)/(x-1), x_range=[1.03, 2, 0.05], color=BLUE)
-        break_point = Circle(radius=0.10, color=BLUE).move_to(ax.c2p(1,3))
-        func_graph = VGroup(graph1, break_point, graph2)
+        # split at the hole in x = 1, with an open circle there
+        func_graph = cached_function_plot(ax, lambda x: (x**3-1)/(x-1), x_range=[-2, 2, 1],
+                                          color=BLUE, hole_radius=0.10)
 
         self.play(Create(ax), Create(func_graph))
         self.next_slide()
 
         # Indicating Hole and Limit
-        self.play(Indicate(break_point, color=RED, scale_factor=2))
+        self.play(Indicate(func_graph.holes[0], color=RED, scale_factor=2))
         self.next_slide()
 
         still = Text("Still", font_size=self.SUBTITLE_FONT_SIZE)
@@ -420,11 +421,11 @@ class TeachingDemo(Slide):
         ax.get_x_axis().numbers.set_color(BLACK)
         ax.get_y_axis().numbers.set_color(BLACK)
         
-        graph1 = ax.plot(lambda x: x, x_range=[-0.5, 0.98, 1], color=BLUE)
-        graph2_point = Circle(radius=0.05, fill_opacity=1, color=BLUE).move_to(ax.c2p(1,2))
-        break_point = Circle(radius=0.05, color=BLUE).move_to(ax.c2p(1,1))
-        graph3 = ax.plot(lambda x: (x-2)**2,x_range=[1.01, 3, 1], color=BLUE)
-        func_graph = VGroup(graph1, break_point, graph2_point, graph3)
+        # f(x) = x for x < 1, f(1) = 2 and f(x) = (x-2)^2 for x > 1
+        func_graph = FunctionPlot(ax, lambda x: np.where(x < 1, x, np.where(x > 1, (x-2)**2, 2)),
+                                  x_range=[-0.5, 3, 1], color=BLUE,
+                                  hole_radius=0.05, dot_radius=0.05)
+        graph2_point = func_graph.dots[0]
         
         self.wipe(self.conclusion, t1)
         self.next_slide()
@@ -0,0 +1,54 @@
+import os
+import shutil
+import sys
+from pathlib import Path
+
+import pytest
+
+import deck
+from deck.daemon import RenderServer
+
+SCENE = """
+from manim import Scene
+
+from deck.geometry import cached_axes
+from deck.readout import GlyphReadout
+
+
+class Demo(Scene):
+    def construct(self):
+        self.add(cached_axes(x_range=[0, 2, 1]), GlyphReadout(1.5))
+"""
+
+
+@pytest.fixture
+def local_deck(tmp_path, monkeypatch):
+    """A scene file next to its own copy of ``deck``, imported from there."""
+    shutil.copytree(Path(deck.__file__).parent, tmp_path / "deck")
+    (tmp_path / "scene.py").write_text(SCENE)
+    for name in [name for name in sys.modules if name == "deck" or name.startswith("deck.")]:
+        monkeypatch.delitem(sys.modules, name)
+    monkeypatch.syspath_prepend(str(tmp_path))
+    monkeypatch.chdir(tmp_path)
+    yield tmp_path
+    for name in [name for name in sys.modules if name == "deck" or name.startswith("deck.")]:
+        del sys.modules[name]
+
+
+def _caches():
+    return len(sys.modules["deck.geometry"]._built), len(sys.modules["deck.readout"]._atlas)
+
+
+def test_render_clears_the_caches_of_reloaded_modules(local_deck):
+    server = RenderServer()
+    options = {"quality": "l", "media_dir": str(local_deck / "media"), "config": {"dry_run": True}}
+    scene = local_deck / "scene.py"
+
+    assert server.render(scene, "Demo", options) == []
+    assert _caches() == (0, 0)
+
+    geometry = local_deck / "deck" / "geometry.py"
+    stat = geometry.stat()
+    os.utime(geometry, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    assert "deck.geometry" in server.render(scene, "Demo", options)
+    assert _caches() == (0, 0)
@@ -0,0 +1,35 @@
+import pytest
+from manim import Dot, config, tempconfig
+
+from deck.draft import DRAFT_FRAME_RATE, DRAFT_HEIGHT, DraftSlide, parse_target
+
+
+class Demo(DraftSlide):
+    sections = ("construct_dot",)
+
+    def construct_dot(self):
+        self.add(Dot())
+
+
+def test_parse_target():
+    assert parse_target("25") == (None, (25, 26))
+    assert parse_target("25+3") == (None, (25, 28))
+    assert parse_target("construct_summary") == ("construct_summary", None)
+    with pytest.raises(ValueError):
+        parse_target("0")
+    with pytest.raises(ValueError):
+        parse_target("construct_summary+2")
+
+
+def test_draft_settings_do_not_outlive_the_render(monkeypatch, tmp_path):
+    monkeypatch.setenv("DECK_DRAFT", "construct_dot")
+    monkeypatch.chdir(tmp_path)
+    settings = {"pixel_width": 1920, "pixel_height": 1080, "frame_rate": 60}
+    with tempconfig({**settings, "dry_run": True, "media_dir": str(tmp_path)}):
+        scene = Demo()
+        assert scene.camera.pixel_height == DRAFT_HEIGHT
+        assert scene.camera.pixel_width == 640
+        assert scene.camera.frame_rate == DRAFT_FRAME_RATE
+
+        scene.render()
+        assert {key: config[key] for key in settings} == settings
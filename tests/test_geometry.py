@@ -0,0 +1,29 @@
+import numpy as np
+from manim import RIGHT, UP
+
+from deck import geometry
+from deck.geometry import cached_axes, cached_function_plot, cached_plot
+
+
+def setup_function():
+    geometry.clear()
+
+
+def parabola(x):
+    return x**2
+
+
+def test_cached_axes_are_copies():
+    first = cached_axes(x_range=[-3, 3, 1], y_range=[0, 6, 1])
+    second = cached_axes(x_range=[-3, 3, 1], y_range=[0, 6, 1])
+    assert first is not second
+    second.shift(RIGHT)
+    np.testing.assert_allclose(first.c2p(0, 0) + RIGHT, second.c2p(0, 0))
+
+
+def test_cached_plot_follows_the_callers_axes():
+    cached_plot(cached_axes(x_range=[-3, 3, 1], y_range=[0, 6, 1]), parabola, x_range=[-2, 2])
+    ax = cached_axes(x_range=[-3, 3, 1], y_range=[0, 6, 1])
+    graph = cached_plot(ax, parabola, x_range=[-2, 2])
+    ax.shift(2 * RIGHT + UP)
+    np.testing.assert_allclose(ax.input_to_graph_point(1, graph), ax.c2p(1, 1))
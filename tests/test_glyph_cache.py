@@ -0,0 +1,101 @@
+import os
+
+import pytest
+from manim import MathTex, TexTemplate, Text, tempconfig
+
+from deck import glyph_cache
+from deck.glyph_cache import GlyphCache, Uncacheable, _cache_key, _key_repr
+
+
+def _age(cache, keys):
+    """Give ``keys`` increasing, distinct modification times, oldest first."""
+    for age, key in enumerate(keys):
+        os.utime(cache._path(key), (1_000_000 + age, 1_000_000 + age))
+    cache._index = None
+    cache._load_index()
+
+
+@pytest.mark.parametrize("reload", [False, True], ids=["memory", "disk"])
+def test_evicts_least_recently_used(tmp_path, reload):
+    cache = GlyphCache(tmp_path, max_bytes=3000)
+    for key in ("k00", "k01", "k02"):
+        cache.put(key, bytes(1000))
+    _age(cache, ["k00", "k01", "k02"])
+    if reload:
+        cache = GlyphCache(tmp_path, max_bytes=3000)
+
+    assert cache.get("k00") is not None
+    cache.put("k03", bytes(1000))
+
+    assert cache._path("k00").exists()
+    assert cache._path("k03").exists()
+    assert not cache._path("k01").exists()
+
+
+def test_hits_and_misses(tmp_path):
+    cache = GlyphCache(tmp_path, max_bytes=2**20)
+    assert cache.get("k00") is None
+    cache.put("k00", b"state")
+    assert GlyphCache(tmp_path, max_bytes=2**20).get("k00") == b"state"
+    assert cache.get("k00") == b"state"
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+
+def test_key_depends_on_arguments():
+    assert _cache_key(Text, ("a",), {}) == _cache_key(Text, ("a",), {})
+    assert _cache_key(Text, ("a",), {}) != _cache_key(Text, ("b",), {})
+    assert _cache_key(Text, ("a",), {}) != _cache_key(Text, ("a",), {"font_size": 20})
+    assert _cache_key(Text, ("a",), {"t2c": {"a": 1, "b": 2}}) == _cache_key(
+        Text, ("a",), {"t2c": {"b": 2, "a": 1}}
+    )
+
+
+def test_key_depends_on_tex_template():
+    template = TexTemplate()
+    template.add_to_preamble(r"\usepackage{mathrsfs}")
+    default = _cache_key(MathTex, ("x",), {})
+    assert _cache_key(MathTex, ("x",), {"tex_template": template}) != default
+    with tempconfig({"tex_template": template}):
+        assert _cache_key(MathTex, ("x",), {}) != default
+    # Text does not go through LaTeX.
+    with tempconfig({"tex_template": template}):
+        assert _cache_key(Text, ("x",), {}) == _cache_key(Text, ("x",), {})
+
+
+def test_unstable_arguments_are_uncacheable():
+    with pytest.raises(Uncacheable):
+        _key_repr(object())
+    with pytest.raises(Uncacheable):
+        _cache_key(Text, ("a",), {"color": object()})
+
+
+@pytest.fixture
+def installed(tmp_path, monkeypatch):
+    """The cache, installed for one test only, in ``tmp_path``."""
+    monkeypatch.delenv("DECK_GLYPH_CACHE", raising=False)
+    monkeypatch.setenv("DECK_CACHE_DIR", str(tmp_path))
+    monkeypatch.setattr(glyph_cache, "_cache", GlyphCache(tmp_path, max_bytes=2**20))
+    monkeypatch.setattr(glyph_cache.atexit, "register", lambda function: function)
+    constructors = {
+        cls: (cls.__dict__["_original__init__"], cls.__dict__["__init__"])
+        for cls in glyph_cache.CACHED_CLASSES
+    }
+    glyph_cache.install()
+    yield glyph_cache._cache
+    for cls, (original, init) in constructors.items():
+        cls._original__init__ = original
+        cls.__init__ = init
+
+
+def test_set_default_is_part_of_the_key(installed):
+    Text("x")
+    Text.set_default(font_size=20)
+    small = Text("x")
+    assert installed.stats()["misses"] == 2
+    assert small.font_size == pytest.approx(20)
+
+    Text.set_default()
+    again = Text("x")
+    assert installed.stats()["hits"] == 1
+    assert again.font_size != pytest.approx(20)
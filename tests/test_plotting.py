@@ -0,0 +1,52 @@
+import numpy as np
+import pytest
+from manim import RIGHT, Axes
+
+from deck.plotting import FunctionPlot
+
+
+@pytest.fixture
+def ax():
+    return Axes(x_range=[-3, 3, 1], y_range=[-4, 6, 1], tips=False)
+
+
+def test_removable_hole(ax):
+    graph = FunctionPlot(ax, lambda x: (x**3 - 1) / (x - 1), x_range=[-2, 2, 1])
+    assert len(graph.hole_points) == 1
+    np.testing.assert_allclose(graph.hole_points[0], (1, 3), atol=1e-6)
+    assert graph.dot_points == []
+    assert len(graph.curves) == 2
+    np.testing.assert_allclose(graph.holes[0].get_center(), ax.c2p(1, 3), atol=1e-6)
+
+
+def test_removable_point_with_another_value(ax):
+    graph = FunctionPlot(
+        ax, lambda x: np.where(x < 1, x, np.where(x > 1, (x - 2) ** 2, 2)), x_range=[0, 3, 1]
+    )
+    np.testing.assert_allclose(graph.hole_points, [(1, 1)], atol=1e-5)
+    np.testing.assert_allclose(graph.dot_points, [(1, 2)])
+    assert len(graph.curves) == 2
+
+
+def test_jump(ax):
+    graph = FunctionPlot(ax, lambda x: np.where(x < 0, -1.0, 1.0), x_range=[-1, 1, 1])
+    np.testing.assert_allclose(graph.hole_points, [(0, -1)])
+    np.testing.assert_allclose(graph.dot_points, [(0, 1)])
+    assert len(graph.curves) == 2
+
+
+def test_asymptote(ax):
+    graph = FunctionPlot(ax, lambda x: 1 / x, x_range=[-2, 2, 1])
+    assert graph.hole_points == []
+    assert graph.dot_points == []
+    assert len(graph.curves) == 2
+    for curve in graph.curves:
+        assert np.isfinite(curve.points).all()
+    # The two branches are not joined across x = 0.
+    assert graph.curves[0].get_end()[0] < ax.c2p(0, 0)[0] < graph.curves[1].get_start()[0]
+
+
+def test_graph_point_follows_the_axes(ax):
+    graph = FunctionPlot(ax, lambda x: (x**3 - 1) / (x - 1), x_range=[-2, 2, 1])
+    ax.shift(RIGHT)
+    np.testing.assert_allclose(ax.input_to_graph_point(0.5, graph), ax.c2p(0.5, 1.75))
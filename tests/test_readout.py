@@ -0,0 +1,50 @@
+import numpy as np
+import pytest
+from manim import DecimalNumber, MathTex, TexTemplate
+
+from deck import readout
+from deck.readout import GlyphReadout
+
+
+@pytest.fixture(autouse=True)
+def fresh_atlas():
+    readout.clear()
+    yield
+    MathTex.set_default()
+
+
+def test_matches_decimal_number():
+    glyphs = GlyphReadout(-3.14159, num_decimal_places=3, font_size=36)
+    number = DecimalNumber(-3.14159, num_decimal_places=3, font_size=36)
+    assert np.allclose(glyphs.get_corner([-1, -1, 0]), number.get_corner([-1, -1, 0]), atol=0.02)
+    assert np.allclose(glyphs.get_corner([1, 1, 0]), number.get_corner([1, 1, 0]), atol=0.02)
+
+
+def _points(mobject):
+    return np.concatenate([mob.points for mob in mobject.family_members_with_points()])
+
+
+@pytest.mark.parametrize("unit", [r"\%", r"^\circ", r"\text{ cm}"])
+def test_units_match_decimal_number(unit):
+    glyphs = GlyphReadout(-12.5, num_decimal_places=1, unit=unit, font_size=36)
+    number = DecimalNumber(-12.5, num_decimal_places=1, unit=unit, font_size=36)
+    assert np.allclose(glyphs.get_center(), number.get_center(), atol=1e-3)
+    assert np.allclose(_points(glyphs), _points(number), atol=1e-3)
+    assert np.allclose(_points(glyphs.unit_sign), _points(number.unit_sign), atol=1e-3)
+
+
+def test_default_font_size_does_not_change_the_layout():
+    width = GlyphReadout(2.5).width
+    MathTex.set_default(font_size=24)
+    readout.clear()
+    assert GlyphReadout(2.5).width == pytest.approx(width, rel=0.01)
+
+
+def test_atlas_follows_the_default_tex_template():
+    GlyphReadout(1)
+    glyphs = len(readout._atlas)
+    template = TexTemplate()
+    template.add_to_preamble(r"\usepackage{mathrsfs}")
+    MathTex.set_default(tex_template=template)
+    GlyphReadout(1)
+    assert len(readout._atlas) == 2 * glyphs
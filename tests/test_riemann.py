@@ -0,0 +1,38 @@
+import numpy as np
+import pytest
+from manim import Axes
+
+from deck.riemann import RiemannSum
+
+
+@pytest.fixture
+def ax():
+    return Axes(x_range=[0, 4, 1], y_range=[0, 5, 1], tips=False)
+
+
+def test_bars_match_get_riemann_rectangles(ax):
+    r = RiemannSum(ax, lambda x: x + 1, [0, 4], dx=1)
+    rectangles = ax.get_riemann_rectangles(ax.plot(lambda x: x + 1), [0, 4], dx=1)
+    assert r.num_bars == len(rectangles)
+    for bar, rectangle in zip(r.points.reshape(-1, 16, 3), rectangles):
+        assert np.allclose(bar.min(axis=0), rectangle.get_corner([-1, -1, 0]), atol=0.01)
+        assert np.allclose(bar.max(axis=0), rectangle.get_corner([1, 1, 0]), atol=0.01)
+
+
+def test_align_splits_each_bar(ax):
+    coarse = RiemannSum(ax, lambda x: x + 1, [0, 4], dx=2)
+    fine = coarse.refine(1)
+    bars = coarse.points.reshape(-1, 16, 3)
+    coarse.align_points(fine)
+    assert coarse.num_bars == fine.num_bars == 4
+    assert np.array_equal(coarse.points.reshape(-1, 16, 3), bars[[0, 0, 1, 1]])
+
+
+def test_create_draws_every_bar(ax):
+    r = RiemannSum(ax, lambda x: x + 1, [0, 4], dx=1)
+    partial = r.copy().pointwise_become_partial(r, 0, 0.5)
+    outlines = partial.points.reshape(4, -1, 3)
+    bars = r.points.reshape(4, 16, 3)
+    # Half of each outline: the bottom and right sides.
+    assert np.allclose(outlines[:, 0], bars[:, 0])
+    assert np.allclose(outlines[:, -1], bars[:, 8])